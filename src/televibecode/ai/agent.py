@@ -19,7 +19,7 @@ from televibecode.ai.mode_selector import (
     suggest_execution_mode,
 )
 from televibecode.db import Database
-from televibecode.db.models import ExecutionMode
+from televibecode.db.models import ExecutionMode, SessionState
 
 log = structlog.get_logger()
 
@@ -874,18 +874,27 @@ class TeleVibeAgent:
             self.set_chat_context(chat_id, active_session=sid)
 
             mode_icon = "📁" if execution_mode == ExecutionMode.DIRECT else "🌳"
+            if result["state"] == SessionState.CREATING.value:
+                status = (
+                    "⏳ Setting up the worktree… it will accept instructions shortly."
+                )
+            else:
+                status = "Ready for instructions."
             return (
                 f"✅ Session **{sid}** created!\n\n"
                 f"📂 Project: {result['project_id']}\n"
                 f"🌿 Branch: {result['branch']}\n"
                 f"{mode_icon} Mode: {execution_mode.value}\n"
                 f"📁 {result['workspace_path']}\n\n"
-                f"Ready for instructions."
+                f"{status}"
             )
 
         elif action.action_type == "close_session":
             session_id = action.params["session_id"]
-            await sessions.close_session(self.db, session_id)
+            settings = self.get_chat_context(chat_id).get("settings")
+            if not settings:
+                return "Missing settings context. Please try again."
+            await sessions.close_session(self.db, settings, session_id)
 
             # Clear active session if it was the one closed
             ctx = self.get_chat_context(chat_id)
@@ -113,6 +113,12 @@ class Settings(BaseSettings):
         description="Maximum concurrent job executions",
     )
 
+    # Cleanup
+    worktree_remover: list[str] | None = Field(
+        default=None,
+        description="Command that deletes closed worktrees, e.g. ['trash-put']",
+    )
+
     # Executor type
     executor_type: Literal["subprocess", "sdk"] = Field(
         default="subprocess",
@@ -151,6 +157,11 @@ class Settings(BaseSettings):
         """Path to workspaces directory."""
         return self.televibe_dir / "workspaces"
 
+    @property
+    def trash_dir(self) -> Path:
+        """Path to the holding area for worktrees awaiting deletion."""
+        return self.televibe_dir / "trash"
+
     def ensure_dirs(self) -> None:
         """Create required directories if they don't exist."""
         self.televibe_dir.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,48 @@
+"""Small in-process caches for hot database reads."""
+
+import time
+from collections import OrderedDict
+
+
+class TTLCache[V]:
+    """Size-bounded cache whose entries expire after a fixed time-to-live.
+
+    Not thread-safe; meant to be used from the event loop only.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 2.0):
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries (oldest are evicted first).
+            ttl: Seconds an entry stays valid.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: str) -> V | None:
+        """Get a live entry, or None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def set(self, key: str, value: V) -> None:
+        """Store an entry, evicting the oldest one when full."""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        """Drop an entry if present."""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._data.clear()
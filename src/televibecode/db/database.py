@@ -1,13 +1,16 @@
 """Async SQLite database operations for TeleVibeCode."""
 
+import asyncio
 import contextlib
 import json
+from collections.abc import AsyncIterator
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
 import aiosqlite
 
+from televibecode.db.cache import TTLCache
 from televibecode.db.models import (
     Approval,
     ApprovalState,
@@ -53,6 +56,8 @@ CREATE TABLE IF NOT EXISTS sessions (
     last_summary TEXT,
     last_diff TEXT,
     open_pr TEXT,
+    last_push_result TEXT,
+    sparse_paths TEXT,
     last_activity_at TEXT DEFAULT (datetime('now')),
     created_at TEXT DEFAULT (datetime('now'))
 );
@@ -126,15 +131,149 @@ CREATE TABLE IF NOT EXISTS user_preferences (
 -- Indexes
 CREATE INDEX IF NOT EXISTS idx_sessions_project ON sessions(project_id);
 CREATE INDEX IF NOT EXISTS idx_sessions_state ON sessions(state);
+CREATE INDEX IF NOT EXISTS idx_sessions_project_branch_active
+    ON sessions(project_id, branch) WHERE state != 'closing';
 CREATE INDEX IF NOT EXISTS idx_tasks_project ON tasks(project_id);
 CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+CREATE INDEX IF NOT EXISTS idx_tasks_project_status ON tasks(project_id, status);
 CREATE INDEX IF NOT EXISTS idx_tasks_session ON tasks(session_id);
 CREATE INDEX IF NOT EXISTS idx_jobs_session ON jobs(session_id);
 CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
+CREATE INDEX IF NOT EXISTS idx_jobs_session_status_created
+    ON jobs(session_id, status, created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_approvals_job ON approvals(job_id);
 CREATE INDEX IF NOT EXISTS idx_approvals_state ON approvals(state);
 """
 
+_PROJECT_COLUMNS = (
+    "project_id, name, path, remote_url, default_branch, "
+    "backlog_enabled, backlog_path, created_at, updated_at"
+)
+
+# Project columns aliased for joins with sessions (avoids name clashes)
+_PROJECT_JOIN_COLUMNS = ", ".join(
+    f"p.{col} AS p_{col}" for col in _PROJECT_COLUMNS.split(", ")
+)
+
+_TASK_INSERT_SQL = """
+    INSERT INTO tasks (
+        task_id, project_id, title, description, status, epic,
+        priority, session_id, branch, assignee, tags,
+        created_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_TASK_UPDATE_SQL = """
+    UPDATE tasks SET
+        title = ?, description = ?, status = ?, epic = ?, priority = ?,
+        session_id = ?, branch = ?, assignee = ?, tags = ?, updated_at = ?
+    WHERE task_id = ?
+"""
+
+
+def _task_insert_params(task: Task) -> tuple:
+    return (
+        task.task_id,
+        task.project_id,
+        task.title,
+        task.description,
+        task.status.value,
+        task.epic,
+        task.priority.value,
+        task.session_id,
+        task.branch,
+        task.assignee,
+        json.dumps(task.tags),
+        task.created_at.isoformat(),
+        task.updated_at.isoformat(),
+    )
+
+
+def _task_update_params(task: Task) -> tuple:
+    return (
+        task.title,
+        task.description,
+        task.status.value,
+        task.epic,
+        task.priority.value,
+        task.session_id,
+        task.branch,
+        task.assignee,
+        json.dumps(task.tags),
+        task.updated_at.isoformat(),
+        task.task_id,
+    )
+
+
+_JOB_UPDATE_SQL = """
+    UPDATE jobs SET
+        status = ?, approval_required = ?, approval_scope = ?,
+        approval_state = ?, log_path = ?, result_summary = ?,
+        files_changed = ?, error = ?, started_at = ?, finished_at = ?
+    WHERE job_id = ?
+"""
+
+
+def _job_update_params(job: Job) -> tuple:
+    return (
+        job.status.value,
+        1 if job.approval_required else 0,
+        job.approval_scope,
+        job.approval_state.value if job.approval_state else None,
+        job.log_path,
+        job.result_summary,
+        json.dumps(job.files_changed) if job.files_changed else None,
+        job.error,
+        job.started_at.isoformat() if job.started_at else None,
+        job.finished_at.isoformat() if job.finished_at else None,
+        job.job_id,
+    )
+
+
+_APPROVAL_INSERT_SQL = """
+    INSERT INTO approvals (
+        approval_id, job_id, session_id, project_id, approval_type,
+        action_description, action_details, state, approved_by,
+        approved_at, telegram_message_id, telegram_chat_id, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_APPROVAL_UPDATE_SQL = """
+    UPDATE approvals SET
+        state = ?, approved_by = ?, approved_at = ?,
+        telegram_message_id = ?, telegram_chat_id = ?
+    WHERE approval_id = ?
+"""
+
+
+def _approval_insert_params(approval: Approval) -> tuple:
+    return (
+        approval.approval_id,
+        approval.job_id,
+        approval.session_id,
+        approval.project_id,
+        approval.approval_type.value,
+        approval.action_description,
+        json.dumps(approval.action_details) if approval.action_details else None,
+        approval.state.value,
+        approval.approved_by,
+        approval.approved_at.isoformat() if approval.approved_at else None,
+        approval.telegram_message_id,
+        approval.telegram_chat_id,
+        approval.created_at.isoformat(),
+    )
+
+
+def _approval_update_params(approval: Approval) -> tuple:
+    return (
+        approval.state.value,
+        approval.approved_by,
+        approval.approved_at.isoformat() if approval.approved_at else None,
+        approval.telegram_message_id,
+        approval.telegram_chat_id,
+        approval.approval_id,
+    )
+
 
 class Database:
     """Async SQLite database manager."""
@@ -147,6 +286,13 @@ class Database:
         """
         self.db_path = db_path
         self._connection: aiosqlite.Connection | None = None
+        # Short-lived read caches, invalidated by this class's own writes
+        self._session_cache: TTLCache[Session] = TTLCache()
+        self._project_cache: TTLCache[Project] = TTLCache()
+        # Serializes writes on the shared connection: each write section and
+        # its commit (or rollback) run without other coroutines' statements
+        # joining the same transaction
+        self._write_lock = asyncio.Lock()
 
     async def connect(self) -> None:
         """Connect to database and initialize schema."""
@@ -202,6 +348,26 @@ class Database:
             )
             await self.conn.commit()
 
+        # Add last_push_result column to sessions if missing
+        try:
+            async with self.conn.execute(
+                "SELECT last_push_result FROM sessions LIMIT 1"
+            ):
+                pass
+        except Exception:
+            await self.conn.execute(
+                "ALTER TABLE sessions ADD COLUMN last_push_result TEXT"
+            )
+            await self.conn.commit()
+
+        # Add sparse_paths column to sessions if missing
+        try:
+            async with self.conn.execute("SELECT sparse_paths FROM sessions LIMIT 1"):
+                pass
+        except Exception:
+            await self.conn.execute("ALTER TABLE sessions ADD COLUMN sparse_paths TEXT")
+            await self.conn.commit()
+
     @property
     def conn(self) -> aiosqlite.Connection:
         """Get active connection."""
@@ -215,28 +381,41 @@ class Database:
 
     async def create_project(self, project: Project) -> Project:
         """Create a new project."""
-        await self.conn.execute(
-            """
-            INSERT INTO projects (
-                project_id, name, path, remote_url, default_branch,
-                backlog_enabled, backlog_path, created_at, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                project.project_id,
-                project.name,
-                project.path,
-                project.remote_url,
-                project.default_branch,
-                1 if project.backlog_enabled else 0,
-                project.backlog_path,
-                project.created_at.isoformat(),
-                project.updated_at.isoformat(),
-            ),
-        )
-        await self.conn.commit()
+        async with self._write_lock:
+            await self.conn.execute(
+                f"""
+                INSERT INTO projects ({_PROJECT_COLUMNS})
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                self._project_to_row(project),
+            )
+            await self.conn.commit()
         return project
 
+    async def create_projects(self, projects: list[Project]) -> list[Project]:
+        """Create several projects in a single transaction.
+
+        Projects whose ID or path is already taken are skipped.
+
+        Returns:
+            The projects that were inserted.
+        """
+        inserted = []
+        async with self._write_lock:
+            for project in projects:
+                cursor = await self.conn.execute(
+                    f"""
+                    INSERT INTO projects ({_PROJECT_COLUMNS})
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT DO NOTHING
+                    """,
+                    self._project_to_row(project),
+                )
+                if cursor.rowcount > 0:
+                    inserted.append(project)
+            await self.conn.commit()
+        return inserted
+
     async def get_project(self, project_id: str) -> Project | None:
         """Get a project by ID."""
         async with self.conn.execute(
@@ -248,6 +427,19 @@ class Database:
                 return self._row_to_project(row)
             return None
 
+    async def get_project_cached(self, project_id: str) -> Project | None:
+        """Get a project by ID through a short-lived read cache.
+
+        Returns a copy, so callers may mutate it freely.
+        """
+        project = self._project_cache.get(project_id)
+        if project is None:
+            project = await self.get_project(project_id)
+            if project is None:
+                return None
+            self._project_cache.set(project_id, project)
+        return project.model_copy(deep=True)
+
     async def get_project_by_path(self, path: str) -> Project | None:
         """Get a project by path."""
         async with self.conn.execute(
@@ -259,45 +451,94 @@ class Database:
                 return self._row_to_project(row)
             return None
 
+    async def get_projects_by_ids(self, project_ids: list[str]) -> dict[str, Project]:
+        """Get projects matching any of the given IDs, keyed by project ID."""
+        if not project_ids:
+            return {}
+        placeholders = ", ".join("?" * len(project_ids))
+        async with self.conn.execute(
+            f"SELECT * FROM projects WHERE project_id IN ({placeholders})",
+            project_ids,
+        ) as cursor:
+            rows = await cursor.fetchall()
+            return {row["project_id"]: self._row_to_project(row) for row in rows}
+
+    async def get_projects_by_paths(self, paths: list[str]) -> dict[str, Project]:
+        """Get projects registered at any of the given paths, keyed by path."""
+        if not paths:
+            return {}
+        placeholders = ", ".join("?" * len(paths))
+        async with self.conn.execute(
+            f"SELECT * FROM projects WHERE path IN ({placeholders})",
+            paths,
+        ) as cursor:
+            rows = await cursor.fetchall()
+            return {row["path"]: self._row_to_project(row) for row in rows}
+
     async def get_all_projects(self) -> list[Project]:
         """Get all projects."""
         async with self.conn.execute("SELECT * FROM projects ORDER BY name") as cursor:
             rows = await cursor.fetchall()
             return [self._row_to_project(row) for row in rows]
 
+    async def iter_projects(self) -> AsyncIterator[Project]:
+        """Iterate over all projects without materializing the full list."""
+        async with self.conn.execute("SELECT * FROM projects ORDER BY name") as cursor:
+            async for row in cursor:
+                yield self._row_to_project(row)
+
     async def update_project(self, project: Project) -> Project:
         """Update an existing project."""
+        self._project_cache.pop(project.project_id)
         project.updated_at = datetime.now(timezone.utc)
-        await self.conn.execute(
-            """
-            UPDATE projects SET
-                name = ?, path = ?, remote_url = ?, default_branch = ?,
-                backlog_enabled = ?, backlog_path = ?, updated_at = ?
-            WHERE project_id = ?
-            """,
-            (
-                project.name,
-                project.path,
-                project.remote_url,
-                project.default_branch,
-                1 if project.backlog_enabled else 0,
-                project.backlog_path,
-                project.updated_at.isoformat(),
-                project.project_id,
-            ),
-        )
-        await self.conn.commit()
+        async with self._write_lock:
+            await self.conn.execute(
+                """
+                UPDATE projects SET
+                    name = ?, path = ?, remote_url = ?, default_branch = ?,
+                    backlog_enabled = ?, backlog_path = ?, updated_at = ?
+                WHERE project_id = ?
+                """,
+                (
+                    project.name,
+                    project.path,
+                    project.remote_url,
+                    project.default_branch,
+                    1 if project.backlog_enabled else 0,
+                    project.backlog_path,
+                    project.updated_at.isoformat(),
+                    project.project_id,
+                ),
+            )
+            await self.conn.commit()
         return project
 
     async def delete_project(self, project_id: str) -> bool:
         """Delete a project."""
-        cursor = await self.conn.execute(
-            "DELETE FROM projects WHERE project_id = ?",
-            (project_id,),
-        )
-        await self.conn.commit()
+        self._project_cache.pop(project_id)
+        self._session_cache.clear()
+        async with self._write_lock:
+            cursor = await self.conn.execute(
+                "DELETE FROM projects WHERE project_id = ?",
+                (project_id,),
+            )
+            await self.conn.commit()
         return cursor.rowcount > 0
 
+    def _project_to_row(self, project: Project) -> tuple[Any, ...]:
+        """Convert Project model to insert parameters (see _PROJECT_COLUMNS)."""
+        return (
+            project.project_id,
+            project.name,
+            project.path,
+            project.remote_url,
+            project.default_branch,
+            1 if project.backlog_enabled else 0,
+            project.backlog_path,
+            project.created_at.isoformat(),
+            project.updated_at.isoformat(),
+        )
+
     def _row_to_project(self, row: aiosqlite.Row) -> Project:
         """Convert database row to Project model."""
         return Project(
@@ -318,35 +559,41 @@ class Database:
 
     async def create_session(self, session: Session) -> Session:
         """Create a new session."""
-        await self.conn.execute(
-            """
-            INSERT INTO sessions (
-                session_id, project_id, display_name, workspace_path, branch,
-                state, execution_mode, superclaude_profile, mcp_profile,
-                attached_task_ids, current_job_id, last_summary, last_diff,
-                open_pr, last_activity_at, created_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                session.session_id,
-                session.project_id,
-                session.display_name,
-                session.workspace_path,
-                session.branch,
-                session.state.value,
-                session.execution_mode.value,
-                session.superclaude_profile,
-                session.mcp_profile,
-                json.dumps(session.attached_task_ids),
-                session.current_job_id,
-                session.last_summary,
-                session.last_diff,
-                session.open_pr,
-                session.last_activity_at.isoformat(),
-                session.created_at.isoformat(),
-            ),
-        )
-        await self.conn.commit()
+        async with self._write_lock:
+            await self.conn.execute(
+                """
+                INSERT INTO sessions (
+                    session_id, project_id, display_name, workspace_path, branch,
+                    state, execution_mode, superclaude_profile, mcp_profile,
+                    attached_task_ids, current_job_id, last_summary, last_diff,
+                    open_pr, sparse_paths, last_activity_at, created_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    session.session_id,
+                    session.project_id,
+                    session.display_name,
+                    session.workspace_path,
+                    session.branch,
+                    session.state.value,
+                    session.execution_mode.value,
+                    session.superclaude_profile,
+                    session.mcp_profile,
+                    json.dumps(session.attached_task_ids),
+                    session.current_job_id,
+                    session.last_summary,
+                    session.last_diff,
+                    session.open_pr,
+                    (
+                        json.dumps(session.sparse_paths)
+                        if session.sparse_paths is not None
+                        else None
+                    ),
+                    session.last_activity_at.isoformat(),
+                    session.created_at.isoformat(),
+                ),
+            )
+            await self.conn.commit()
         return session
 
     async def get_session(self, session_id: str) -> Session | None:
@@ -360,15 +607,89 @@ class Database:
                 return self._row_to_session(row)
             return None
 
-    async def get_sessions_by_project(self, project_id: str) -> list[Session]:
-        """Get all sessions for a project."""
+    async def get_sessions_by_project(
+        self, project_id: str, include_closed: bool = True
+    ) -> list[Session]:
+        """Get sessions for a project, optionally excluding closing ones."""
         async with self.conn.execute(
-            "SELECT * FROM sessions WHERE project_id = ? ORDER BY created_at DESC",
-            (project_id,),
+            """
+            SELECT * FROM sessions
+            WHERE project_id = ? AND (? OR state != 'closing')
+            ORDER BY created_at DESC
+            """,
+            (project_id, include_closed),
         ) as cursor:
             rows = await cursor.fetchall()
             return [self._row_to_session(row) for row in rows]
 
+    async def get_session_cached(self, session_id: str) -> Session | None:
+        """Get a session by ID through a short-lived read cache.
+
+        Returns a copy, so callers may mutate it freely.
+        """
+        session = self._session_cache.get(session_id)
+        if session is None:
+            session = await self.get_session(session_id)
+            if session is None:
+                return None
+            self._session_cache.set(session_id, session)
+        return session.model_copy(deep=True)
+
+    async def get_session_with_project(
+        self, session_id: str
+    ) -> tuple[Session, Project | None] | None:
+        """Get a session and its project in one query.
+
+        Returns:
+            (session, project) tuple, with project None if it no longer
+            exists, or None if the session does not exist.
+        """
+        async with self.conn.execute(
+            f"""
+            SELECT s.*, {_PROJECT_JOIN_COLUMNS}
+            FROM sessions s LEFT JOIN projects p ON p.project_id = s.project_id
+            WHERE s.session_id = ?
+            """,
+            (session_id,),
+        ) as cursor:
+            row = await cursor.fetchone()
+            if not row:
+                return None
+            project = None
+            if row["p_project_id"] is not None:
+                project = self._row_to_project(
+                    {col: row[f"p_{col}"] for col in _PROJECT_COLUMNS.split(", ")}
+                )
+            return self._row_to_session(row), project
+
+    async def get_session_by_branch(
+        self, project_id: str, branch: str
+    ) -> Session | None:
+        """Get the newest non-closing session of a project on a branch."""
+        async with self.conn.execute(
+            """
+            SELECT * FROM sessions
+            WHERE project_id = ? AND branch = ? AND state != 'closing'
+            ORDER BY created_at DESC LIMIT 1
+            """,
+            (project_id, branch),
+        ) as cursor:
+            row = await cursor.fetchone()
+            return self._row_to_session(row) if row else None
+
+    async def get_active_direct_session(self, project_id: str) -> Session | None:
+        """Get the newest non-closing direct-mode session of a project."""
+        async with self.conn.execute(
+            """
+            SELECT * FROM sessions
+            WHERE project_id = ? AND execution_mode = ? AND state != 'closing'
+            ORDER BY created_at DESC LIMIT 1
+            """,
+            (project_id, ExecutionMode.DIRECT.value),
+        ) as cursor:
+            row = await cursor.fetchone()
+            return self._row_to_session(row) if row else None
+
     async def get_all_sessions(self) -> list[Session]:
         """Get all sessions."""
         async with self.conn.execute(
@@ -377,6 +698,30 @@ class Database:
             rows = await cursor.fetchall()
             return [self._row_to_session(row) for row in rows]
 
+    async def stream_sessions(
+        self, project_id: str | None = None, include_closed: bool = False
+    ) -> AsyncIterator[tuple[Session, str | None]]:
+        """Stream sessions with their project name, one row at a time.
+
+        Project-scoped results are ordered by creation time, the rest by last
+        activity (matching get_sessions_by_project / get_active_sessions).
+
+        Yields:
+            Tuples of (session, project name or None).
+        """
+        order = "s.created_at" if project_id else "s.last_activity_at"
+        async with self.conn.execute(
+            f"""
+            SELECT s.*, p.name AS project_name
+            FROM sessions s LEFT JOIN projects p ON p.project_id = s.project_id
+            WHERE (? IS NULL OR s.project_id = ?) AND (? OR s.state != 'closing')
+            ORDER BY {order} DESC
+            """,
+            (project_id, project_id, include_closed),
+        ) as cursor:
+            async for row in cursor:
+                yield self._row_to_session(row), row["project_name"]
+
     async def get_active_sessions(self) -> list[Session]:
         """Get sessions that are not closing."""
         async with self.conn.execute(
@@ -391,55 +736,194 @@ class Database:
 
     async def update_session(self, session: Session) -> Session:
         """Update an existing session."""
+        self._session_cache.pop(session.session_id)
         session.last_activity_at = datetime.now(timezone.utc)
-        await self.conn.execute(
-            """
-            UPDATE sessions SET
-                display_name = ?, workspace_path = ?, branch = ?, state = ?,
-                execution_mode = ?, superclaude_profile = ?, mcp_profile = ?,
-                attached_task_ids = ?, current_job_id = ?, last_summary = ?,
-                last_diff = ?, open_pr = ?, last_activity_at = ?
-            WHERE session_id = ?
-            """,
-            (
-                session.display_name,
-                session.workspace_path,
-                session.branch,
-                session.state.value,
-                session.execution_mode.value,
-                session.superclaude_profile,
-                session.mcp_profile,
-                json.dumps(session.attached_task_ids),
-                session.current_job_id,
-                session.last_summary,
-                session.last_diff,
-                session.open_pr,
-                session.last_activity_at.isoformat(),
-                session.session_id,
-            ),
-        )
-        await self.conn.commit()
+        async with self._write_lock:
+            await self.conn.execute(
+                """
+                UPDATE sessions SET
+                    display_name = ?, workspace_path = ?, branch = ?, state = ?,
+                    execution_mode = ?, superclaude_profile = ?, mcp_profile = ?,
+                    attached_task_ids = ?, current_job_id = ?, last_summary = ?,
+                    last_diff = ?, open_pr = ?, last_activity_at = ?
+                WHERE session_id = ?
+                """,
+                (
+                    session.display_name,
+                    session.workspace_path,
+                    session.branch,
+                    session.state.value,
+                    session.execution_mode.value,
+                    session.superclaude_profile,
+                    session.mcp_profile,
+                    json.dumps(session.attached_task_ids),
+                    session.current_job_id,
+                    session.last_summary,
+                    session.last_diff,
+                    session.open_pr,
+                    session.last_activity_at.isoformat(),
+                    session.session_id,
+                ),
+            )
+            await self.conn.commit()
         return session
 
+    async def attach_task_to_session(
+        self, session_id: str, task_id: str, branch: str, point_task: bool = True
+    ) -> bool:
+        """Attach a task to a session and point the task at it, atomically.
+
+        Args:
+            session_id: Session to attach to.
+            task_id: Task to attach.
+            branch: Branch to record on the task.
+            point_task: Also set the task's session and branch. Pass False
+                when the caller has already written them.
+
+        Returns:
+            True if attached, False if the session is missing or the task was
+            already attached.
+        """
+        self._session_cache.pop(session_id)
+        now = datetime.now(timezone.utc).isoformat()
+        async with self._write_lock:
+            cursor = await self.conn.execute(
+                """
+                UPDATE sessions SET
+                    attached_task_ids = json_insert(
+                        COALESCE(attached_task_ids, '[]'), '$[#]', ?
+                    ),
+                    last_activity_at = ?
+                WHERE session_id = ? AND NOT EXISTS (
+                    SELECT 1 FROM json_each(COALESCE(sessions.attached_task_ids, '[]'))
+                    WHERE value = ?
+                )
+                """,
+                (task_id, now, session_id, task_id),
+            )
+            attached = cursor.rowcount > 0
+            if attached and point_task:
+                await self.conn.execute(
+                    """
+                    UPDATE tasks SET session_id = ?, branch = ?, updated_at = ?
+                    WHERE task_id = ?
+                    """,
+                    (session_id, branch, now, task_id),
+                )
+            await self.conn.commit()
+        return attached
+
+    async def detach_task_from_session(self, session_id: str, task_id: str) -> bool:
+        """Detach a task from a session, atomically.
+
+        The task's session reference is cleared only if it still points at
+        this session.
+
+        Returns:
+            True if detached, False if the task was not attached.
+        """
+        self._session_cache.pop(session_id)
+        now = datetime.now(timezone.utc).isoformat()
+        async with self._write_lock:
+            cursor = await self.conn.execute(
+                """
+                UPDATE sessions SET
+                    attached_task_ids = (
+                        SELECT json_group_array(value)
+                        FROM json_each(sessions.attached_task_ids)
+                        WHERE value != ?
+                    ),
+                    last_activity_at = ?
+                WHERE session_id = ? AND EXISTS (
+                    SELECT 1 FROM json_each(COALESCE(sessions.attached_task_ids, '[]'))
+                    WHERE value = ?
+                )
+                """,
+                (task_id, now, session_id, task_id),
+            )
+            detached = cursor.rowcount > 0
+            if detached:
+                await self.conn.execute(
+                    """
+                    UPDATE tasks SET session_id = NULL, updated_at = ?
+                    WHERE task_id = ? AND session_id = ?
+                    """,
+                    (now, task_id, session_id),
+                )
+            await self.conn.commit()
+        return detached
+
+    async def set_session_push_result(
+        self, session_id: str, result: dict[str, Any]
+    ) -> bool:
+        """Record the outcome of the latest push of a session's branch."""
+        self._session_cache.pop(session_id)
+        async with self._write_lock:
+            cursor = await self.conn.execute(
+                "UPDATE sessions SET last_push_result = ? WHERE session_id = ?",
+                (json.dumps(result), session_id),
+            )
+            await self.conn.commit()
+        return cursor.rowcount > 0
+
     async def update_session_state(self, session_id: str, state: SessionState) -> bool:
         """Update session state."""
-        cursor = await self.conn.execute(
-            """
-            UPDATE sessions SET state = ?, last_activity_at = ?
-            WHERE session_id = ?
-            """,
-            (state.value, datetime.now(timezone.utc).isoformat(), session_id),
-        )
-        await self.conn.commit()
+        self._session_cache.pop(session_id)
+        async with self._write_lock:
+            cursor = await self.conn.execute(
+                """
+                UPDATE sessions SET state = ?, last_activity_at = ?
+                WHERE session_id = ?
+                """,
+                (state.value, datetime.now(timezone.utc).isoformat(), session_id),
+            )
+            await self.conn.commit()
+        return cursor.rowcount > 0
+
+    async def fail_interrupted_setups(self) -> int:
+        """Mark sessions left in CREATING (setup died with the process) as FAILED.
+
+        Returns:
+            Number of sessions updated.
+        """
+        self._session_cache.clear()
+        async with self._write_lock:
+            cursor = await self.conn.execute(
+                """
+                UPDATE sessions SET state = 'failed',
+                    last_summary = 'Worktree setup was interrupted by a restart',
+                    last_activity_at = ?
+                WHERE state = 'creating'
+                """,
+                (datetime.now(timezone.utc).isoformat(),),
+            )
+            await self.conn.commit()
+        return cursor.rowcount
+
+    async def release_session_job(self, session_id: str, job_id: str) -> bool:
+        """Mark a session idle if its current job is still the given job."""
+        self._session_cache.pop(session_id)
+        async with self._write_lock:
+            cursor = await self.conn.execute(
+                """
+                UPDATE sessions SET state = 'idle', current_job_id = NULL,
+                    last_activity_at = ?
+                WHERE session_id = ? AND current_job_id = ?
+                """,
+                (datetime.now(timezone.utc).isoformat(), session_id, job_id),
+            )
+            await self.conn.commit()
         return cursor.rowcount > 0
 
     async def delete_session(self, session_id: str) -> bool:
         """Delete a session."""
-        cursor = await self.conn.execute(
-            "DELETE FROM sessions WHERE session_id = ?",
-            (session_id,),
-        )
-        await self.conn.commit()
+        self._session_cache.pop(session_id)
+        async with self._write_lock:
+            cursor = await self.conn.execute(
+                "DELETE FROM sessions WHERE session_id = ?",
+                (session_id,),
+            )
+            await self.conn.commit()
         return cursor.rowcount > 0
 
     async def get_next_session_number(self) -> int:
@@ -453,7 +937,7 @@ class Database:
 
     def _row_to_session(self, row: aiosqlite.Row) -> Session:
         """Convert database row to Session model."""
-        return Session(
+        session = Session(
             session_id=row["session_id"],
             project_id=row["project_id"],
             display_name=row["display_name"],
@@ -468,9 +952,18 @@ class Database:
             last_summary=row["last_summary"],
             last_diff=row["last_diff"],
             open_pr=row["open_pr"],
+            last_push_result=json.loads(row["last_push_result"] or "null"),
+            sparse_paths=json.loads(row["sparse_paths"] or "null"),
             last_activity_at=datetime.fromisoformat(row["last_activity_at"]),
             created_at=datetime.fromisoformat(row["created_at"]),
         )
+        # Timestamps are stored via isoformat(), so the row strings are exact
+        session._iso_cache["last_activity_at"] = (
+            session.last_activity_at,
+            row["last_activity_at"],
+        )
+        session._iso_cache["created_at"] = (session.created_at, row["created_at"])
+        return session
 
     # =========================================================================
     # Task CRUD
@@ -478,33 +971,42 @@ class Database:
 
     async def create_task(self, task: Task) -> Task:
         """Create a new task."""
-        await self.conn.execute(
-            """
-            INSERT INTO tasks (
-                task_id, project_id, title, description, status, epic,
-                priority, session_id, branch, assignee, tags,
-                created_at, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                task.task_id,
-                task.project_id,
-                task.title,
-                task.description,
-                task.status.value,
-                task.epic,
-                task.priority.value,
-                task.session_id,
-                task.branch,
-                task.assignee,
-                json.dumps(task.tags),
-                task.created_at.isoformat(),
-                task.updated_at.isoformat(),
-            ),
-        )
-        await self.conn.commit()
+        async with self._write_lock:
+            await self.conn.execute(_TASK_INSERT_SQL, _task_insert_params(task))
+            await self.conn.commit()
         return task
 
+    async def bulk_create_tasks(self, tasks: list[Task]) -> None:
+        """Create many tasks in one transaction."""
+        await self.bulk_save_tasks(tasks, [])
+
+    async def bulk_save_tasks(
+        self, to_create: list[Task], to_update: list[Task]
+    ) -> None:
+        """Create and update tasks together in a single transaction.
+
+        Either every write lands or, on error, none of them do.
+        """
+        if not to_create and not to_update:
+            return
+        now = datetime.now(timezone.utc)
+        for task in to_update:
+            task.updated_at = now
+        async with self._write_lock:
+            try:
+                if to_create:
+                    await self.conn.executemany(
+                        _TASK_INSERT_SQL, [_task_insert_params(t) for t in to_create]
+                    )
+                if to_update:
+                    await self.conn.executemany(
+                        _TASK_UPDATE_SQL, [_task_update_params(t) for t in to_update]
+                    )
+            except BaseException:
+                await self.conn.rollback()
+                raise
+            await self.conn.commit()
+
     async def get_task(self, task_id: str) -> Task | None:
         """Get a task by ID."""
         async with self.conn.execute(
@@ -516,16 +1018,29 @@ class Database:
                 return self._row_to_task(row)
             return None
 
-    async def get_tasks_by_project(self, project_id: str) -> list[Task]:
-        """Get all tasks for a project."""
-        async with self.conn.execute(
-            """
-            SELECT * FROM tasks
-            WHERE project_id = ?
-            ORDER BY priority DESC, created_at
-            """,
-            (project_id,),
-        ) as cursor:
+    async def get_tasks_by_project(
+        self,
+        project_id: str,
+        status: TaskStatus | None = None,
+        limit: int | None = None,
+    ) -> list[Task]:
+        """Get tasks for a project, optionally filtered by status and capped."""
+        # Separate statements so the status filter can use the
+        # (project_id, status) index
+        limit_value = -1 if limit is None else limit
+        if status is None:
+            query = """
+                SELECT * FROM tasks WHERE project_id = ?
+                ORDER BY priority DESC, created_at LIMIT ?
+                """
+            params: tuple[Any, ...] = (project_id, limit_value)
+        else:
+            query = """
+                SELECT * FROM tasks WHERE project_id = ? AND status = ?
+                ORDER BY priority DESC, created_at LIMIT ?
+                """
+            params = (project_id, status.value, limit_value)
+        async with self.conn.execute(query, params) as cursor:
             rows = await cursor.fetchall()
             return [self._row_to_task(row) for row in rows]
 
@@ -550,40 +1065,72 @@ class Database:
             rows = await cursor.fetchall()
             return [self._row_to_task(row) for row in rows]
 
+    async def get_pending_task_summaries(
+        self,
+        project_id: str,
+        limit: int = 10,
+        description_max: int = 200,
+    ) -> list[dict[str, Any]]:
+        """Get pending tasks as summaries, ordered like get_pending_tasks.
+
+        Only the listed columns are read and the description is truncated
+        in SQL, so no Task models are built.
+
+        Returns:
+            Dicts with task_id, title, status, priority, epic and description
+            (None when empty).
+        """
+        async with self.conn.execute(
+            """
+            SELECT task_id, title, status, priority, epic,
+                NULLIF(substr(description, 1, ?), '') AS description
+            FROM tasks
+            WHERE project_id = ? AND status IN ('todo', 'in_progress')
+            ORDER BY
+                CASE priority
+                    WHEN 'critical' THEN 1
+                    WHEN 'high' THEN 2
+                    WHEN 'medium' THEN 3
+                    WHEN 'low' THEN 4
+                END,
+                created_at
+            LIMIT ?
+            """,
+            (description_max, project_id, limit),
+        ) as cursor:
+            rows = await cursor.fetchall()
+            return [
+                {
+                    "task_id": row["task_id"],
+                    "title": row["title"],
+                    "status": row["status"],
+                    "priority": row["priority"],
+                    "epic": row["epic"],
+                    "description": row["description"],
+                }
+                for row in rows
+            ]
+
     async def update_task(self, task: Task) -> Task:
         """Update an existing task."""
         task.updated_at = datetime.now(timezone.utc)
-        await self.conn.execute(
-            """
-            UPDATE tasks SET
-                title = ?, description = ?, status = ?, epic = ?, priority = ?,
-                session_id = ?, branch = ?, assignee = ?, tags = ?, updated_at = ?
-            WHERE task_id = ?
-            """,
-            (
-                task.title,
-                task.description,
-                task.status.value,
-                task.epic,
-                task.priority.value,
-                task.session_id,
-                task.branch,
-                task.assignee,
-                json.dumps(task.tags),
-                task.updated_at.isoformat(),
-                task.task_id,
-            ),
-        )
-        await self.conn.commit()
+        async with self._write_lock:
+            await self.conn.execute(_TASK_UPDATE_SQL, _task_update_params(task))
+            await self.conn.commit()
         return task
 
+    async def bulk_update_tasks(self, tasks: list[Task]) -> None:
+        """Update many tasks in one transaction."""
+        await self.bulk_save_tasks([], tasks)
+
     async def delete_task(self, task_id: str) -> bool:
         """Delete a task."""
-        cursor = await self.conn.execute(
-            "DELETE FROM tasks WHERE task_id = ?",
-            (task_id,),
-        )
-        await self.conn.commit()
+        async with self._write_lock:
+            cursor = await self.conn.execute(
+                "DELETE FROM tasks WHERE task_id = ?",
+                (task_id,),
+            )
+            await self.conn.commit()
         return cursor.rowcount > 0
 
     def _row_to_task(self, row: aiosqlite.Row) -> Task:
@@ -610,35 +1157,36 @@ class Database:
 
     async def create_job(self, job: Job) -> Job:
         """Create a new job."""
-        await self.conn.execute(
-            """
-            INSERT INTO jobs (
-                job_id, session_id, project_id, instruction, raw_input,
-                status, approval_required, approval_scope, approval_state,
-                log_path, result_summary, files_changed, error,
-                created_at, started_at, finished_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                job.job_id,
-                job.session_id,
-                job.project_id,
-                job.instruction,
-                job.raw_input,
-                job.status.value,
-                1 if job.approval_required else 0,
-                job.approval_scope,
-                job.approval_state.value if job.approval_state else None,
-                job.log_path,
-                job.result_summary,
-                json.dumps(job.files_changed) if job.files_changed else None,
-                job.error,
-                job.created_at.isoformat(),
-                job.started_at.isoformat() if job.started_at else None,
-                job.finished_at.isoformat() if job.finished_at else None,
-            ),
-        )
-        await self.conn.commit()
+        async with self._write_lock:
+            await self.conn.execute(
+                """
+                INSERT INTO jobs (
+                    job_id, session_id, project_id, instruction, raw_input,
+                    status, approval_required, approval_scope, approval_state,
+                    log_path, result_summary, files_changed, error,
+                    created_at, started_at, finished_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    job.job_id,
+                    job.session_id,
+                    job.project_id,
+                    job.instruction,
+                    job.raw_input,
+                    job.status.value,
+                    1 if job.approval_required else 0,
+                    job.approval_scope,
+                    job.approval_state.value if job.approval_state else None,
+                    job.log_path,
+                    job.result_summary,
+                    json.dumps(job.files_changed) if job.files_changed else None,
+                    job.error,
+                    job.created_at.isoformat(),
+                    job.started_at.isoformat() if job.started_at else None,
+                    job.finished_at.isoformat() if job.finished_at else None,
+                ),
+            )
+            await self.conn.commit()
         return job
 
     async def get_job(self, job_id: str) -> Job | None:
@@ -652,17 +1200,65 @@ class Database:
                 return self._row_to_job(row)
             return None
 
-    async def get_jobs_by_session(self, session_id: str, limit: int = 20) -> list[Job]:
-        """Get jobs for a session."""
+    async def get_jobs_by_session(
+        self,
+        session_id: str,
+        limit: int = 20,
+        status: JobStatus | None = None,
+    ) -> list[Job]:
+        """Get jobs for a session, optionally filtered by status."""
+        if status is None:
+            query = """
+                SELECT * FROM jobs WHERE session_id = ?
+                ORDER BY created_at DESC LIMIT ?
+                """
+            params: tuple[Any, ...] = (session_id, limit)
+        else:
+            query = """
+                SELECT * FROM jobs WHERE session_id = ? AND status = ?
+                ORDER BY created_at DESC LIMIT ?
+                """
+            params = (session_id, status.value, limit)
+        async with self.conn.execute(query, params) as cursor:
+            rows = await cursor.fetchall()
+            return [self._row_to_job(row) for row in rows]
+
+    async def get_job_summaries_by_session(
+        self,
+        session_id: str,
+        limit: int = 5,
+        instruction_max: int = 50,
+    ) -> list[dict[str, Any]]:
+        """Get recent job summaries for a session.
+
+        The instruction is truncated in SQL (with a trailing "...") so long
+        prompts are never transferred in full.
+
+        Returns:
+            Dicts with job_id, status, instruction and created_at (ISO string).
+        """
         async with self.conn.execute(
             """
-            SELECT * FROM jobs WHERE session_id = ?
+            SELECT job_id, status, created_at,
+                CASE WHEN length(instruction) > ?
+                    THEN substr(instruction, 1, ?) || '...'
+                    ELSE instruction
+                END AS instruction
+            FROM jobs WHERE session_id = ?
             ORDER BY created_at DESC LIMIT ?
             """,
-            (session_id, limit),
+            (instruction_max, instruction_max, session_id, limit),
         ) as cursor:
             rows = await cursor.fetchall()
-            return [self._row_to_job(row) for row in rows]
+            return [
+                {
+                    "job_id": row["job_id"],
+                    "status": row["status"],
+                    "instruction": row["instruction"],
+                    "created_at": row["created_at"],
+                }
+                for row in rows
+            ]
 
     async def get_running_jobs(self) -> list[Job]:
         """Get all currently running jobs."""
@@ -682,29 +1278,9 @@ class Database:
 
     async def update_job(self, job: Job) -> Job:
         """Update an existing job."""
-        await self.conn.execute(
-            """
-            UPDATE jobs SET
-                status = ?, approval_required = ?, approval_scope = ?,
-                approval_state = ?, log_path = ?, result_summary = ?,
-                files_changed = ?, error = ?, started_at = ?, finished_at = ?
-            WHERE job_id = ?
-            """,
-            (
-                job.status.value,
-                1 if job.approval_required else 0,
-                job.approval_scope,
-                job.approval_state.value if job.approval_state else None,
-                job.log_path,
-                job.result_summary,
-                json.dumps(job.files_changed) if job.files_changed else None,
-                job.error,
-                job.started_at.isoformat() if job.started_at else None,
-                job.finished_at.isoformat() if job.finished_at else None,
-                job.job_id,
-            ),
-        )
-        await self.conn.commit()
+        async with self._write_lock:
+            await self.conn.execute(_JOB_UPDATE_SQL, _job_update_params(job))
+            await self.conn.commit()
         return job
 
     async def update_job_status(self, job_id: str, status: JobStatus) -> bool:
@@ -717,13 +1293,40 @@ class Database:
             updates["finished_at"] = datetime.now(timezone.utc).isoformat()
 
         set_clause = ", ".join(f"{k} = ?" for k in updates)
-        cursor = await self.conn.execute(
-            f"UPDATE jobs SET {set_clause} WHERE job_id = ?",
-            (*updates.values(), job_id),
-        )
-        await self.conn.commit()
+        async with self._write_lock:
+            cursor = await self.conn.execute(
+                f"UPDATE jobs SET {set_clause} WHERE job_id = ?",
+                (*updates.values(), job_id),
+            )
+            await self.conn.commit()
         return cursor.rowcount > 0
 
+    async def cancel_job_atomic(
+        self, job_id: str, finished_at: datetime, error: str = "Cancelled by user"
+    ) -> Job | None:
+        """Cancel a job if it is still queued or running.
+
+        The status check and the write happen in a single UPDATE so a job
+        that completes concurrently is never clobbered.
+
+        Returns:
+            The canceled job, or None if no queued/running job matched.
+        """
+        async with self._write_lock:
+            async with self.conn.execute(
+                """
+                UPDATE jobs SET status = 'canceled', error = ?, finished_at = ?
+                WHERE job_id = ? AND status IN ('queued', 'running')
+                RETURNING *
+                """,
+                (error, finished_at.isoformat(), job_id),
+            ) as cursor:
+                row = await cursor.fetchone()
+            await self.conn.commit()
+        if row:
+            return self._row_to_job(row)
+        return None
+
     def _row_to_job(self, row: aiosqlite.Row) -> Job:
         """Convert database row to Job model."""
         return Job(
@@ -759,33 +1362,11 @@ class Database:
 
     async def create_approval(self, approval: Approval) -> Approval:
         """Create a new approval request."""
-        await self.conn.execute(
-            """
-            INSERT INTO approvals (
-                approval_id, job_id, session_id, project_id, approval_type,
-                action_description, action_details, state, approved_by,
-                approved_at, telegram_message_id, telegram_chat_id, created_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                approval.approval_id,
-                approval.job_id,
-                approval.session_id,
-                approval.project_id,
-                approval.approval_type.value,
-                approval.action_description,
-                json.dumps(approval.action_details)
-                if approval.action_details
-                else None,
-                approval.state.value,
-                approval.approved_by,
-                approval.approved_at.isoformat() if approval.approved_at else None,
-                approval.telegram_message_id,
-                approval.telegram_chat_id,
-                approval.created_at.isoformat(),
-            ),
-        )
-        await self.conn.commit()
+        async with self._write_lock:
+            await self.conn.execute(
+                _APPROVAL_INSERT_SQL, _approval_insert_params(approval)
+            )
+            await self.conn.commit()
         return approval
 
     async def get_approval(self, approval_id: str) -> Approval | None:
@@ -829,25 +1410,37 @@ class Database:
 
     async def update_approval(self, approval: Approval) -> Approval:
         """Update an approval."""
-        await self.conn.execute(
-            """
-            UPDATE approvals SET
-                state = ?, approved_by = ?, approved_at = ?,
-                telegram_message_id = ?, telegram_chat_id = ?
-            WHERE approval_id = ?
-            """,
-            (
-                approval.state.value,
-                approval.approved_by,
-                approval.approved_at.isoformat() if approval.approved_at else None,
-                approval.telegram_message_id,
-                approval.telegram_chat_id,
-                approval.approval_id,
-            ),
-        )
-        await self.conn.commit()
+        async with self._write_lock:
+            await self.conn.execute(
+                _APPROVAL_UPDATE_SQL, _approval_update_params(approval)
+            )
+            await self.conn.commit()
         return approval
 
+    async def open_approval(self, job: Job, approval: Approval) -> None:
+        """Create an approval and save its waiting job in one transaction."""
+        await self._save_approval_and_job(
+            _APPROVAL_INSERT_SQL, _approval_insert_params(approval), job
+        )
+
+    async def resolve_approval(self, job: Job, approval: Approval) -> None:
+        """Save an approval decision and its job in one transaction."""
+        await self._save_approval_and_job(
+            _APPROVAL_UPDATE_SQL, _approval_update_params(approval), job
+        )
+
+    async def _save_approval_and_job(
+        self, approval_sql: str, approval_params: tuple, job: Job
+    ) -> None:
+        async with self._write_lock:
+            try:
+                await self.conn.execute(approval_sql, approval_params)
+                await self.conn.execute(_JOB_UPDATE_SQL, _job_update_params(job))
+            except BaseException:
+                await self.conn.rollback()
+                raise
+            await self.conn.commit()
+
     async def approve(self, approval_id: str, approved_by: str) -> Approval | None:
         """Approve an approval request."""
         approval = await self.get_approval(approval_id)
@@ -941,18 +1534,21 @@ class Database:
             provider: Provider name ("openrouter" or "gemini").
         """
         now = datetime.now(timezone.utc).isoformat()
-        await self.conn.execute(
-            """
-            INSERT INTO user_preferences (chat_id, ai_model_id, ai_provider, updated_at)
-            VALUES (?, ?, ?, ?)
-            ON CONFLICT(chat_id) DO UPDATE SET
-                ai_model_id = excluded.ai_model_id,
-                ai_provider = excluded.ai_provider,
-                updated_at = excluded.updated_at
-            """,
-            (chat_id, model_id, provider, now),
-        )
-        await self.conn.commit()
+        async with self._write_lock:
+            await self.conn.execute(
+                """
+                INSERT INTO user_preferences (
+                    chat_id, ai_model_id, ai_provider, updated_at
+                )
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(chat_id) DO UPDATE SET
+                    ai_model_id = excluded.ai_model_id,
+                    ai_provider = excluded.ai_provider,
+                    updated_at = excluded.updated_at
+                """,
+                (chat_id, model_id, provider, now),
+            )
+            await self.conn.commit()
 
     async def set_user_active_session(
         self, chat_id: int, session_id: str | None
@@ -964,17 +1560,18 @@ class Database:
             session_id: Session ID or None to clear.
         """
         now = datetime.now(timezone.utc).isoformat()
-        await self.conn.execute(
-            """
-            INSERT INTO user_preferences (chat_id, active_session_id, updated_at)
-            VALUES (?, ?, ?)
-            ON CONFLICT(chat_id) DO UPDATE SET
-                active_session_id = excluded.active_session_id,
-                updated_at = excluded.updated_at
-            """,
-            (chat_id, session_id, now),
-        )
-        await self.conn.commit()
+        async with self._write_lock:
+            await self.conn.execute(
+                """
+                INSERT INTO user_preferences (chat_id, active_session_id, updated_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(chat_id) DO UPDATE SET
+                    active_session_id = excluded.active_session_id,
+                    updated_at = excluded.updated_at
+                """,
+                (chat_id, session_id, now),
+            )
+            await self.conn.commit()
 
     async def set_user_notifications(
         self, chat_id: int, enabled: bool
@@ -986,17 +1583,20 @@ class Database:
             enabled: Whether notifications are enabled.
         """
         now = datetime.now(timezone.utc).isoformat()
-        await self.conn.execute(
-            """
-            INSERT INTO user_preferences (chat_id, notifications_enabled, updated_at)
-            VALUES (?, ?, ?)
-            ON CONFLICT(chat_id) DO UPDATE SET
-                notifications_enabled = excluded.notifications_enabled,
-                updated_at = excluded.updated_at
-            """,
-            (chat_id, 1 if enabled else 0, now),
-        )
-        await self.conn.commit()
+        async with self._write_lock:
+            await self.conn.execute(
+                """
+                INSERT INTO user_preferences (
+                    chat_id, notifications_enabled, updated_at
+                )
+                VALUES (?, ?, ?)
+                ON CONFLICT(chat_id) DO UPDATE SET
+                    notifications_enabled = excluded.notifications_enabled,
+                    updated_at = excluded.updated_at
+                """,
+                (chat_id, 1 if enabled else 0, now),
+            )
+            await self.conn.commit()
 
     async def get_tracker_config(
         self, chat_id: int
@@ -1033,18 +1633,21 @@ class Database:
             preset: Preset name.
         """
         now = datetime.now(timezone.utc).isoformat()
-        await self.conn.execute(
-            """
-            INSERT INTO user_preferences (chat_id, tracker_preset, tracker_config, updated_at)
-            VALUES (?, ?, '{}', ?)
-            ON CONFLICT(chat_id) DO UPDATE SET
-                tracker_preset = excluded.tracker_preset,
-                tracker_config = '{}',
-                updated_at = excluded.updated_at
-            """,
-            (chat_id, preset, now),
-        )
-        await self.conn.commit()
+        async with self._write_lock:
+            await self.conn.execute(
+                """
+                INSERT INTO user_preferences (
+                    chat_id, tracker_preset, tracker_config, updated_at
+                )
+                VALUES (?, ?, '{}', ?)
+                ON CONFLICT(chat_id) DO UPDATE SET
+                    tracker_preset = excluded.tracker_preset,
+                    tracker_config = '{}',
+                    updated_at = excluded.updated_at
+                """,
+                (chat_id, preset, now),
+            )
+            await self.conn.commit()
 
     async def update_tracker_config(
         self, chat_id: int, key: str, value: Any
@@ -1062,17 +1665,18 @@ class Database:
         config_json = json.dumps(current_config)
 
         now = datetime.now(timezone.utc).isoformat()
-        await self.conn.execute(
-            """
-            INSERT INTO user_preferences (chat_id, tracker_config, updated_at)
-            VALUES (?, ?, ?)
-            ON CONFLICT(chat_id) DO UPDATE SET
-                tracker_config = excluded.tracker_config,
-                updated_at = excluded.updated_at
-            """,
-            (chat_id, config_json, now),
-        )
-        await self.conn.commit()
+        async with self._write_lock:
+            await self.conn.execute(
+                """
+                INSERT INTO user_preferences (chat_id, tracker_config, updated_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(chat_id) DO UPDATE SET
+                    tracker_config = excluded.tracker_config,
+                    updated_at = excluded.updated_at
+                """,
+                (chat_id, config_json, now),
+            )
+            await self.conn.commit()
 
     async def set_tracker_config(
         self, chat_id: int, config: dict[str, Any]
@@ -1085,14 +1689,15 @@ class Database:
         """
         config_json = json.dumps(config)
         now = datetime.now(timezone.utc).isoformat()
-        await self.conn.execute(
-            """
-            INSERT INTO user_preferences (chat_id, tracker_config, updated_at)
-            VALUES (?, ?, ?)
-            ON CONFLICT(chat_id) DO UPDATE SET
-                tracker_config = excluded.tracker_config,
-                updated_at = excluded.updated_at
-            """,
-            (chat_id, config_json, now),
-        )
-        await self.conn.commit()
+        async with self._write_lock:
+            await self.conn.execute(
+                """
+                INSERT INTO user_preferences (chat_id, tracker_config, updated_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(chat_id) DO UPDATE SET
+                    tracker_config = excluded.tracker_config,
+                    updated_at = excluded.updated_at
+                """,
+                (chat_id, config_json, now),
+            )
+            await self.conn.commit()
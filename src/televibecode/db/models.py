@@ -2,8 +2,9 @@
 
 from datetime import datetime, timezone
 from enum import Enum
+from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 def _utc_now() -> datetime:
@@ -14,10 +15,12 @@ def _utc_now() -> datetime:
 class SessionState(str, Enum):
     """Session state enumeration."""
 
+    CREATING = "creating"  # Worktree still being materialized
     IDLE = "idle"
     RUNNING = "running"
     BLOCKED = "blocked"
     CLOSING = "closing"
+    FAILED = "failed"  # Worktree creation failed
 
 
 class ExecutionMode(str, Enum):
@@ -96,9 +99,34 @@ class Session(BaseModel):
     last_summary: str | None = None
     last_diff: str | None = None
     open_pr: str | None = None
+    last_push_result: dict[str, Any] | None = None
+    sparse_paths: list[str] | None = None  # Sparse-checkout roots, if any
     last_activity_at: datetime = Field(default_factory=_utc_now)
     created_at: datetime = Field(default_factory=_utc_now)
 
+    # ISO strings keyed by field name, valid while the field holds the same
+    # datetime object; the database primes it with the stored strings
+    _iso_cache: dict[str, tuple[datetime, str]] = PrivateAttr(default_factory=dict)
+
+    def _iso(self, name: str) -> str:
+        value = getattr(self, name)
+        cached = self._iso_cache.get(name)
+        if cached is not None and cached[0] is value:
+            return cached[1]
+        iso = value.isoformat()
+        self._iso_cache[name] = (value, iso)
+        return iso
+
+    @property
+    def last_activity_at_iso(self) -> str:
+        """last_activity_at as an ISO 8601 string."""
+        return self._iso("last_activity_at")
+
+    @property
+    def created_at_iso(self) -> str:
+        """created_at as an ISO 8601 string."""
+        return self._iso("created_at")
+
 
 class Task(BaseModel):
     """Represents a backlog item (from Backlog.md or similar)."""
@@ -16,6 +16,7 @@ from televibecode import __version__
 from televibecode.config import load_settings
 from televibecode.db import Database
 from televibecode.orchestrator import create_mcp_server
+from televibecode.orchestrator.tools.sessions import empty_trash
 from televibecode.telegram import create_bot
 
 # ANSI color codes
@@ -215,6 +216,17 @@ async def serve(root: Path) -> None:
     await db.connect()
     log.info("database_ready", path=str(settings.db_path))
 
+    # Worktree setups run in the background; any left mid-way by a previous
+    # process will never finish
+    interrupted = await db.fail_interrupted_setups()
+    if interrupted:
+        log.warning("session_setups_interrupted", count=interrupted)
+
+    # Finish deleting worktrees a previous process trashed but did not remove
+    trashed = await empty_trash(settings)
+    if trashed:
+        log.info("trash_cleanup_started", count=trashed)
+
     # Create MCP server
     _ = create_mcp_server(db, settings.televibe_root)
     log.info("mcp_server_ready")
@@ -284,6 +296,20 @@ async def serve(root: Path) -> None:
     log.info("televibecode_stopped")
 
 
+def _run(coro) -> None:
+    """Run a coroutine on uvloop when installed, else the default loop.
+
+    uvloop (``televibecode[fast]``, not available on Windows) makes the
+    subprocess pipe reads and task switches of running jobs cheaper.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(coro)
+    else:
+        uvloop.run(coro)
+
+
 def main() -> None:
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -337,9 +363,9 @@ def main() -> None:
     args = parser.parse_args()
 
     if args.command == "serve":
-        asyncio.run(serve(args.root))
+        _run(serve(args.root))
     elif args.command == "scan":
-        asyncio.run(scan_only(args.root))
+        _run(scan_only(args.root))
     elif args.command == "supervised":
         run_supervised(args.root)
     else:
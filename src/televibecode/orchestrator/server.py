@@ -146,16 +146,35 @@ def _register_session_tools(mcp: FastMCP) -> None:
         return json.dumps(result, indent=2)
 
     @mcp.tool()
-    async def get_session_status(session_id: str) -> str:
+    async def get_session_status(session_id: str, detailed: bool = False) -> str:
         """Get detailed status for a session including git status.
 
         Args:
             session_id: The session identifier.
+            detailed: Force a fresh git status instead of a recent cached one.
 
         Returns status details or error.
         """
         try:
-            result = await sessions.get_session_status(_db, session_id)
+            result = await sessions.get_session_status(_db, session_id, detailed)
+            return json.dumps(result, indent=2)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+
+    @mcp.tool()
+    async def push_session_branch(session_id: str, wait: bool = False) -> str:
+        """Push a session's branch to origin.
+
+        Args:
+            session_id: The session identifier.
+            wait: Wait for the push instead of returning right away. A push
+                left running reports its outcome in get_session_status
+                (``last_push_result``).
+
+        Returns push result or error.
+        """
+        try:
+            result = await sessions.push_session_branch(_db, session_id, wait)
             return json.dumps(result, indent=2)
         except ValueError as e:
             return json.dumps({"error": str(e)})
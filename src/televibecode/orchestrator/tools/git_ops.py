@@ -1,9 +1,69 @@
 """Git operations for worktree and branch management."""
 
+import contextlib
+import os
+import re
+import subprocess
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import cached_property, wraps
 from pathlib import Path
+from typing import Concatenate
 
 from git import Repo
 from git.exc import GitCommandError
+from git.repo.fun import is_git_dir
+
+# Abbreviated SHA length (matches git's default core.abbrev minimum)
+SHORT_SHA_LENGTH = 7
+
+# Characters that are not alphanumeric (per str.isalnum) or a hyphen
+_NON_BRANCH_CHARS = re.compile(r"[^\w-]|_")
+
+# Submodule initialization may reach the remote: never prompt for
+# credentials, and give up after this many seconds per submodule
+_NON_INTERACTIVE_ENV = {"GIT_TERMINAL_PROMPT": "0", "GIT_ASKPASS": "true"}
+_SUBMODULE_TIMEOUT = 120.0
+
+# Maximum number of project repositories kept open by get_git_ops()
+_GIT_OPS_CACHE_SIZE = 64
+
+
+def is_git_repo(path: str | Path) -> bool:
+    """Check whether a path is a git repository without opening it.
+
+    Accepts a working tree with a ``.git`` directory, a linked worktree or
+    submodule whose ``.git`` is a gitfile, or a bare repository.
+
+    Args:
+        path: Path to check.
+
+    Returns:
+        True if the path looks like a git repository.
+    """
+    path = Path(path)
+    dot_git = path / ".git"
+    if dot_git.is_file():
+        return True
+    return is_git_dir(dot_git) or is_git_dir(path)
+
+
+def _serialized[**P, R](
+    method: Callable[Concatenate["GitOperations", P], R],
+) -> Callable[Concatenate["GitOperations", P], R]:
+    """Run a method under the instance lock.
+
+    GitPython's persistent ``cat-file`` processes are not thread-safe, and
+    shared instances are used from several ``asyncio.to_thread`` workers.
+    """
+
+    @wraps(method)
+    def wrapper(self: "GitOperations", *args: P.args, **kwargs: P.kwargs) -> R:
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
 
 
 class GitOperations:
@@ -19,25 +79,50 @@ class GitOperations:
             ValueError: If path is not a valid git repository.
         """
         self.repo_path = Path(repo_path)
+        if not is_git_repo(self.repo_path):
+            raise ValueError(f"Not a valid git repository: {repo_path}")
+        self._lock = threading.RLock()
+
+    @cached_property
+    def repo(self) -> Repo:
+        """GitPython repository, constructed on first use."""
         try:
-            self.repo = Repo(self.repo_path)
+            return Repo(self.repo_path)
         except Exception as e:
-            raise ValueError(f"Not a valid git repository: {repo_path}") from e
+            raise ValueError(f"Not a valid git repository: {self.repo_path}") from e
+
+    def close(self) -> None:
+        """Close the Repo, if opened, and its persistent git processes."""
+        with self._lock:
+            repo = self.__dict__.pop("repo", None)
+            if repo is not None:
+                repo.close()
 
+    @_serialized
     def create_worktree(
         self,
         worktree_path: str | Path,
         branch: str,
         create_branch: bool = True,
         base_branch: str | None = None,
+        reference_path: str | Path | None = None,
+        sparse_paths: list[str] | None = None,
     ) -> dict:
         """Create a new git worktree.
 
+        Worktrees already share the repository's object store. When
+        ``reference_path`` is given, submodules that are initialized in that
+        checkout are also initialized in the new worktree, borrowing their
+        objects via ``--reference`` instead of fetching them again.
+
         Args:
             worktree_path: Path where worktree will be created.
             branch: Branch name for the worktree.
             create_branch: If True, create a new branch.
             base_branch: Base branch for new branch (defaults to HEAD).
+            reference_path: Checkout whose submodule objects to reuse.
+            sparse_paths: If given, only check out these directories (cone
+                mode sparse checkout); nothing else is ever materialized.
 
         Returns:
             Dictionary with worktree details.
@@ -51,23 +136,125 @@ class GitOperations:
         worktree_path.parent.mkdir(parents=True, exist_ok=True)
 
         try:
+            # With sparse paths, defer checkout until the cone is configured
+            add_args = ["add", "--no-checkout"] if sparse_paths else ["add"]
             if create_branch:
                 # Create new branch and worktree
                 base = base_branch or self.get_default_branch()
-                self.repo.git.worktree("add", "-b", branch, str(worktree_path), base)
+                self.repo.git.worktree(
+                    *add_args, "-b", branch, str(worktree_path), base
+                )
             else:
                 # Use existing branch
-                self.repo.git.worktree("add", str(worktree_path), branch)
+                self.repo.git.worktree(*add_args, str(worktree_path), branch)
+
+            if sparse_paths:
+                self.configure_sparse_checkout(worktree_path, sparse_paths)
+                Repo(worktree_path).git.checkout()
+
+            submodules = []
+            if reference_path is not None:
+                submodules = self._init_submodules(worktree_path, reference_path)
 
             return {
                 "worktree_path": str(worktree_path),
                 "branch": branch,
                 "created": True,
+                "submodules": submodules,
+                "sparse_paths": sparse_paths,
             }
 
         except GitCommandError as e:
             raise GitCommandError(f"Failed to create worktree: {e.stderr or e}") from e
 
+    def configure_sparse_checkout(
+        self, worktree_path: str | Path, paths: list[str]
+    ) -> None:
+        """Restrict a worktree to the given directories (cone mode).
+
+        The setting is per worktree; the main checkout is unaffected.
+
+        Args:
+            worktree_path: Worktree to configure.
+            paths: Directories to keep, relative to the repository root.
+
+        Raises:
+            GitCommandError: If git rejects the configuration.
+        """
+        Repo(worktree_path).git.sparse_checkout("set", "--cone", "--", *paths)
+
+    def _init_submodules(
+        self,
+        worktree_path: Path,
+        reference_path: str | Path,
+    ) -> list[str]:
+        """Initialize a new worktree's submodules from a reference checkout.
+
+        Only submodules whose repository already exists under the reference
+        checkout's ``modules/`` directory are initialized. Their objects are
+        borrowed from there, but git still clones from the submodule URL and
+        may contact the remote, so it runs without credential prompts and is
+        killed after a timeout. Failures leave the submodule uninitialized.
+
+        Args:
+            worktree_path: Newly created worktree.
+            reference_path: Checkout whose submodule repositories to borrow.
+
+        Returns:
+            Paths of the submodules that were initialized.
+        """
+        if not (worktree_path / ".gitmodules").is_file():
+            return []
+
+        if Path(reference_path) == self.repo_path:
+            modules_dir = Path(self.repo.common_dir) / "modules"
+        else:
+            modules_dir = Path(Repo(reference_path).common_dir) / "modules"
+
+        wt_git = Repo(worktree_path).git
+        try:
+            entries = wt_git.config(
+                "-f", ".gitmodules", "--get-regexp", r"^submodule\..*\.path$"
+            ).splitlines()
+        except GitCommandError:
+            return []
+
+        initialized = []
+        for entry in entries:
+            key, _, sub_path = entry.partition(" ")
+            name = key[len("submodule.") : -len(".path")]
+            reference = modules_dir / name
+            if not is_git_dir(reference):
+                continue
+            with (
+                contextlib.suppress(GitCommandError),
+                wt_git.custom_environment(**_NON_INTERACTIVE_ENV),
+            ):
+                wt_git.submodule(
+                    "update",
+                    "--init",
+                    "--reference",
+                    str(reference),
+                    "--",
+                    sub_path,
+                    kill_after_timeout=_SUBMODULE_TIMEOUT,
+                )
+                initialized.append(sub_path)
+        return initialized
+
+    def _is_clean_with_submodules(self, worktree_path: Path) -> bool:
+        """Check that a worktree has submodules and no changes in any of them."""
+        if not (worktree_path / ".gitmodules").is_file():
+            return False
+        try:
+            status = Repo(worktree_path).git.status(
+                "--porcelain", "--ignore-submodules=none"
+            )
+        except (GitCommandError, ValueError):
+            return False
+        return not status
+
+    @_serialized
     def remove_worktree(self, worktree_path: str | Path, force: bool = False) -> dict:
         """Remove a git worktree.
 
@@ -81,7 +268,9 @@ class GitOperations:
         worktree_path = Path(worktree_path)
 
         try:
-            if force:
+            if force or self._is_clean_with_submodules(worktree_path):
+                # git refuses to remove any worktree with submodules unless
+                # forced, so clean ones (submodules included) are forced too
                 self.repo.git.worktree("remove", "--force", str(worktree_path))
             else:
                 self.repo.git.worktree("remove", str(worktree_path))
@@ -101,6 +290,12 @@ class GitOperations:
                 }
             raise
 
+    @_serialized
+    def prune_worktrees(self) -> None:
+        """Drop administrative entries for worktrees whose folders are gone."""
+        self.repo.git.worktree("prune")
+
+    @_serialized
     def list_worktrees(self) -> list[dict]:
         """List all worktrees for this repository.
 
@@ -134,6 +329,7 @@ class GitOperations:
 
         return worktrees
 
+    @_serialized
     def create_branch(
         self,
         branch_name: str,
@@ -169,6 +365,7 @@ class GitOperations:
                 f"Failed to create branch '{branch_name}': {e.stderr or e}"
             ) from e
 
+    @_serialized
     def delete_branch(self, branch_name: str, force: bool = False) -> dict:
         """Delete a branch.
 
@@ -208,51 +405,51 @@ class GitOperations:
         Returns:
             Dictionary with branch status.
         """
-        repo = Repo(worktree_path) if worktree_path else self.repo
-
-        try:
-            branch = repo.active_branch.name
-        except TypeError:
-            branch = "HEAD (detached)"
-
-        # Get status
-        status = repo.git.status("--porcelain")
-        has_changes = bool(status.strip())
+        path = Path(worktree_path) if worktree_path else self.repo_path
 
-        # Count changes
+        branch = "HEAD (detached)"
         staged = 0
         unstaged = 0
         untracked = 0
-
-        for line in status.split("\n"):
-            if not line:
-                continue
-            index_status = line[0]
-            work_status = line[1]
-
-            if index_status == "?":
-                untracked += 1
-            else:
-                if index_status != " ":
-                    staged += 1
-                if work_status != " ":
-                    unstaged += 1
-
-        # Get ahead/behind if tracking
         ahead = 0
         behind = 0
-        try:
-            tracking = repo.active_branch.tracking_branch()
-            if tracking:
-                ahead_behind = repo.git.rev_list(
-                    "--left-right", "--count", f"{tracking.name}...HEAD"
-                )
-                parts = ahead_behind.split()
-                if len(parts) == 2:
-                    behind = int(parts[0])
-                    ahead = int(parts[1])
-        except Exception:
-            pass
+
+        # Stream porcelain v2 output line by line instead of buffering the
+        # whole status; the --branch header also carries ahead/behind counts.
+        proc = subprocess.Popen(
+            ["git", "-C", str(path), "status", "--porcelain=v2", "--branch"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=1,
+            text=True,
+        )
+        assert proc.stdout is not None
+        with proc:
+            for line in proc.stdout:
+                kind = line[0]
+                if kind == "#":
+                    if line.startswith("# branch.head "):
+                        head = line[14:].rstrip("\n")
+                        if head != "(detached)":
+                            branch = head
+                    elif line.startswith("# branch.ab "):
+                        parts = line[12:].split()
+                        if len(parts) == 2:
+                            ahead = int(parts[0])
+                            behind = -int(parts[1])
+                elif kind == "?":
+                    untracked += 1
+                elif kind in "12u":
+                    # Ordinary/renamed/unmerged entries: "<kind> XY ..."
+                    if line[2] != ".":
+                        staged += 1
+                    if line[3] != ".":
+                        unstaged += 1
+
+        if proc.returncode != 0:
+            raise GitCommandError(["git", "status"], proc.returncode)
+
+        has_changes = bool(staged or unstaged or untracked)
 
         return {
             "branch": branch,
@@ -264,20 +461,25 @@ class GitOperations:
             "behind": behind,
         }
 
+    @_serialized
     def get_branch_drift(
         self, branch: str, base_branch: str | None = None, worktree_path: str | Path | None = None
     ) -> dict:
         """Get how far a branch has drifted from base branch.
 
+        Linked worktrees share refs with the main repository, so everything is
+        answered from this repository without opening the worktree.
+
         Args:
             branch: Branch to check.
             base_branch: Base branch to compare against (defaults to main/master).
-            worktree_path: Path to worktree (uses main repo if None).
+            worktree_path: Path to worktree (accepted for compatibility; refs
+                are shared with the main repository).
 
         Returns:
             Dictionary with drift info.
         """
-        repo = Repo(worktree_path) if worktree_path else self.repo
+        repo = self.repo
         base = base_branch or self.get_default_branch()
 
         try:
@@ -289,13 +491,8 @@ class GitOperations:
             behind_main = int(parts[0]) if len(parts) >= 1 else 0
             ahead_main = int(parts[1]) if len(parts) >= 2 else 0
 
-            # Check if branch exists on remote
-            is_pushed = False
-            try:
-                repo.git.rev_parse("--verify", f"refs/remotes/origin/{branch}")
-                is_pushed = True
-            except Exception:
-                pass
+            # Check if branch exists on remote (read from refs, no git process)
+            is_pushed = self._ref_exists(f"refs/remotes/origin/{branch}")
 
             # Get last commit info
             last_commit = repo.git.log("-1", "--format=%h %s", branch)
@@ -316,6 +513,23 @@ class GitOperations:
                 "error": str(e),
             }
 
+    def _ref_exists(self, ref: str) -> bool:
+        """Check for a fully qualified ref as a loose or packed ref file."""
+        common_dir = Path(self.repo.common_dir)
+        if (common_dir / ref).is_file():
+            return True
+        try:
+            with open(common_dir / "packed-refs", encoding="utf-8") as packed:
+                for line in packed:
+                    if line[0] in "#^":
+                        continue
+                    if line.rstrip("\n").partition(" ")[2] == ref:
+                        return True
+        except FileNotFoundError:
+            pass
+        return False
+
+    @_serialized
     def push_branch(self, branch: str, force: bool = False) -> dict:
         """Push a branch to origin.
 
@@ -343,6 +557,7 @@ class GitOperations:
                 "error": str(e),
             }
 
+    @_serialized
     def get_default_branch(self) -> str:
         """Get the default branch name.
 
@@ -356,13 +571,22 @@ class GitOperations:
         except Exception:
             pass
 
-        # Check common defaults
-        for branch in ["main", "master"]:
-            try:
-                self.repo.git.rev_parse("--verify", branch)
-                return branch
-            except Exception:
-                continue
+        # Check common defaults via loose refs on disk (no subprocess)
+        heads_dir = Path(self.repo.common_dir) / "refs" / "heads"
+        with contextlib.suppress(OSError), os.scandir(heads_dir) as entries:
+            loose = {entry.name for entry in entries if entry.is_file()}
+            for branch in ("main", "master"):
+                if branch in loose:
+                    return branch
+
+        # Packed refs: one for-each-ref call covers both names
+        with contextlib.suppress(Exception):
+            packed: str = self.repo.git.for_each_ref(
+                "--format=%(refname:short)", "refs/heads/main", "refs/heads/master"
+            )
+            for branch in ("main", "master"):
+                if branch in packed.split("\n"):
+                    return branch
 
         # Fall back to current branch
         try:
@@ -370,6 +594,7 @@ class GitOperations:
         except TypeError:
             return "main"
 
+    @_serialized
     def branch_exists(self, branch_name: str) -> bool:
         """Check if a branch exists.
 
@@ -379,23 +604,23 @@ class GitOperations:
         Returns:
             True if branch exists.
         """
-        try:
-            self.repo.git.rev_parse("--verify", f"refs/heads/{branch_name}")
-            return True
-        except Exception:
-            return False
+        # Read the ref files directly instead of forking `git rev-parse`
+        return self._ref_exists(f"refs/heads/{branch_name}")
 
+    @_serialized
     def get_current_branch(self) -> str:
         """Get the current branch name.
 
         Returns:
             Current branch name or 'HEAD' if detached.
         """
+        # active_branch parses .git/HEAD in-process; no git subprocess
         try:
             return self.repo.active_branch.name
         except TypeError:
             return "HEAD"
 
+    @_serialized
     def get_short_sha(self, ref: str = "HEAD") -> str:
         """Get short SHA for a ref.
 
@@ -405,9 +630,15 @@ class GitOperations:
         Returns:
             Short SHA string.
         """
-        result: str = self.repo.git.rev_parse("--short", ref)
-        return result
+        # Resolved through GitPython's persistent `git cat-file --batch-check`
+        # process, so repeated lookups don't fork git each time.
+        try:
+            hexsha, _, _ = self.repo.git.get_object_header(ref)
+        except ValueError as e:
+            raise GitCommandError(["git", "cat-file", ref], 128, str(e)) from e
+        return hexsha.decode("ascii")[:SHORT_SHA_LENGTH]
 
+    @_serialized
     def get_commit_count(self, branch: str | None = None) -> int:
         """Get commit count for a branch.
 
@@ -441,8 +672,45 @@ def generate_session_branch(
     if description:
         # Sanitize description for branch name
         clean = description.lower()
-        clean = "".join(c if c.isalnum() or c == "-" else "-" for c in clean)
+        clean = _NON_BRANCH_CHARS.sub("-", clean)
         clean = "-".join(filter(None, clean.split("-")))[:30]
         if clean:
             base = f"{base}-{clean}"
     return base
+
+
+_git_ops_cache: OrderedDict[str, GitOperations] = OrderedDict()
+_git_ops_cache_lock = threading.Lock()
+
+
+def get_git_ops(repo_path: str) -> GitOperations:
+    """Get a shared GitOperations instance for a project repository.
+
+    Reusing the instance keeps its lazily opened Repo (and GitPython's
+    persistent git processes) across tool calls. Only pass project roots:
+    session worktrees come and go, and would pin their processes here.
+    The least recently used instance is closed once the cache is full.
+
+    Args:
+        repo_path: Path to the git repository.
+
+    Raises:
+        ValueError: If path is not a valid git repository.
+    """
+    with _git_ops_cache_lock:
+        git_ops = _git_ops_cache.get(repo_path)
+        if git_ops is not None:
+            _git_ops_cache.move_to_end(repo_path)
+            return git_ops
+
+    git_ops = GitOperations(repo_path)
+    evicted = None
+    with _git_ops_cache_lock:
+        # Another caller may have raced us here; keep the first instance
+        git_ops = _git_ops_cache.setdefault(repo_path, git_ops)
+        _git_ops_cache.move_to_end(repo_path)
+        if len(_git_ops_cache) > _GIT_OPS_CACHE_SIZE:
+            _, evicted = _git_ops_cache.popitem(last=False)
+    if evicted is not None:
+        evicted.close()
+    return git_ops
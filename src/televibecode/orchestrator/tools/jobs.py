@@ -1,9 +1,14 @@
 """MCP tools for job management."""
 
+import contextlib
+from collections.abc import Callable
 from datetime import datetime, timezone
 
 from televibecode.config import Settings
-from televibecode.db import Database, JobStatus, SessionState
+from televibecode.db import Database, Job, JobStatus
+from televibecode.runner import (
+    cancel_running_job as _cancel_running_job,
+)
 from televibecode.runner import (
     get_job_logs as _get_job_logs,
 )
@@ -18,6 +23,51 @@ from televibecode.runner import (
 )
 
 
+def _truncate(text: str, limit: int) -> str:
+    """Truncate text to ``limit`` characters, appending an ellipsis if cut."""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+# Serialized list entries keyed by (view, job_id, status). Every field in these
+# payloads is fixed once a job reaches a given status, so UI polling that
+# lists the same jobs repeatedly skips the isoformat/truncation work.
+_PAYLOAD_CACHE_SIZE = 1024
+_payload_cache: dict[tuple[str, str, str], dict] = {}
+
+
+def _cached_payload(view: str, job: Job, build: Callable[[Job], dict]) -> dict:
+    """Return a copy of the cached payload for a job, building it on a miss."""
+    key = (view, job.job_id, job.status.value)
+    payload = _payload_cache.get(key)
+    if payload is None:
+        if len(_payload_cache) >= _PAYLOAD_CACHE_SIZE:
+            _payload_cache.clear()
+        payload = _payload_cache[key] = build(job)
+    return dict(payload)
+
+
+def _list_entry(job: Job) -> dict:
+    """Build the list_jobs entry for a job."""
+    return {
+        "job_id": job.job_id,
+        "session_id": job.session_id,
+        "status": job.status.value,
+        "instruction": _truncate(job.instruction, 50),
+        "created_at": job.created_at.isoformat(),
+    }
+
+
+def _running_entry(job: Job) -> dict:
+    """Build the list_running_jobs entry for a job."""
+    return {
+        "job_id": job.job_id,
+        "session_id": job.session_id,
+        "project_id": job.project_id,
+        "instruction": _truncate(job.instruction, 50),
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+    }
+
+
 async def run_instruction(
     db: Database,
     settings: Settings,
@@ -42,9 +92,7 @@ async def run_instruction(
         "session_id": job.session_id,
         "project_id": job.project_id,
         "status": job.status.value,
-        "instruction": job.instruction[:100] + "..."
-        if len(job.instruction) > 100
-        else job.instruction,
+        "instruction": _truncate(job.instruction, 100),
         "created_at": job.created_at.isoformat(),
         "message": f"Job {job.job_id} started in session {session_id}",
     }
@@ -83,39 +131,27 @@ async def list_jobs(
     Returns:
         List of job dictionaries.
     """
-    if session_id:
-        jobs = await _list_session_jobs(db, session_id, limit=limit)
-    else:
-        # Get all recent jobs from database
-        all_jobs = []
-        all_sessions = await db.get_all_sessions()
-        for session in all_sessions:
-            session_jobs = await db.get_jobs_by_session(session.session_id, limit=limit)
-            all_jobs.extend(session_jobs)
-
-        # Sort by created_at and limit
-        all_jobs.sort(key=lambda j: j.created_at, reverse=True)
-        jobs = [
-            {
-                "job_id": j.job_id,
-                "session_id": j.session_id,
-                "status": j.status.value,
-                "instruction": j.instruction[:50] + "..."
-                if len(j.instruction) > 50
-                else j.instruction,
-                "created_at": j.created_at.isoformat(),
-            }
-            for j in all_jobs[:limit]
-        ]
-
+    status_enum = None
     if status:
-        try:
+        with contextlib.suppress(ValueError):
             status_enum = JobStatus(status)
-            jobs = [j for j in jobs if j.get("status") == status_enum.value]
-        except ValueError:
-            pass
 
-    return jobs
+    if session_id:
+        # Filter in SQL so the result is a full page of matching jobs
+        return await _list_session_jobs(db, session_id, limit=limit, status=status_enum)
+
+    # Get all recent jobs from database
+    all_jobs = []
+    all_sessions = await db.get_all_sessions()
+    for session in all_sessions:
+        session_jobs = await db.get_jobs_by_session(
+            session.session_id, limit=limit, status=status_enum
+        )
+        all_jobs.extend(session_jobs)
+
+    # Sort by created_at and limit
+    all_jobs.sort(key=lambda j: j.created_at, reverse=True)
+    return [_cached_payload("list", j, _list_entry) for j in all_jobs[:limit]]
 
 
 async def get_job_logs(
@@ -149,25 +185,20 @@ async def cancel_job(
     Returns:
         Result dictionary.
     """
-    job = await db.get_job(job_id)
+    job = await db.cancel_job_atomic(job_id, datetime.now(timezone.utc))
     if not job:
-        raise ValueError(f"Job '{job_id}' not found")
+        existing = await db.get_job(job_id)
+        if not existing:
+            raise ValueError(f"Job '{job_id}' not found")
+        raise ValueError(
+            f"Job '{job_id}' is not running (status: {existing.status.value})"
+        )
 
-    if job.status not in (JobStatus.QUEUED, JobStatus.RUNNING):
-        raise ValueError(f"Job '{job_id}' is not running (status: {job.status.value})")
+    # Release the session only if it still points at this job
+    await db.release_session_job(job.session_id, job_id)
 
-    # Update status
-    job.status = JobStatus.CANCELED
-    job.error = "Cancelled by user"
-    job.finished_at = datetime.now(timezone.utc)
-    await db.update_job(job)
-
-    # Update session
-    session = await db.get_session(job.session_id)
-    if session:
-        session.state = SessionState.IDLE
-        session.current_job_id = None
-        await db.update_session(session)
+    # Stop the Claude process if this server started it
+    await _cancel_running_job(job_id)
 
     return {
         "job_id": job_id,
@@ -201,25 +232,5 @@ async def list_running_jobs(db: Database) -> list[dict]:
     Returns:
         List of running job dictionaries.
     """
-    all_sessions = await db.get_all_sessions()
-    running = []
-
-    for session in all_sessions:
-        if session.current_job_id:
-            job = await db.get_job(session.current_job_id)
-            if job and job.status == JobStatus.RUNNING:
-                running.append(
-                    {
-                        "job_id": job.job_id,
-                        "session_id": job.session_id,
-                        "project_id": job.project_id,
-                        "instruction": job.instruction[:50] + "..."
-                        if len(job.instruction) > 50
-                        else job.instruction,
-                        "started_at": job.started_at.isoformat()
-                        if job.started_at
-                        else None,
-                    }
-                )
-
-    return running
+    jobs = await db.get_running_jobs()
+    return [_cached_payload("running", job, _running_entry) for job in jobs]
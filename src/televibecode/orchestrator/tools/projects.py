@@ -1,40 +1,87 @@
 """MCP tools for project management."""
 
+import asyncio
 import contextlib
+import functools
+import getpass
+import os
 import re
+import shutil
+import socket
 import subprocess
+from collections.abc import AsyncIterator
 from pathlib import Path
 
 from git import InvalidGitRepositoryError, Repo
+from git.config import GitConfigParser
 
 from televibecode.db import Database, Project
+from televibecode.orchestrator.tools.git_ops import is_git_repo
+
+# Backlog directory names, in order of preference
+_BACKLOG_DIR_NAMES = ("backlog", "Backlog", ".backlog")
+
+# Appended to directory entry paths when probing for a repository
+_GIT_SUFFIX = os.sep + ".git"
+
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+# Valid project name: dash-separated lowercase words starting with a letter
+_NAME_RE = re.compile(r"^[a-z][a-z0-9]*(?:-[a-z0-9]+)*$")
+_NAME_CHARS_RE = re.compile(r"^[a-z][a-z0-9-]*$")
+
+# .gitignore written into newly created projects
+_GITIGNORE_BYTES = (
+    b"# IDE\n"
+    b".idea/\n"
+    b".vscode/\n"
+    b"*.swp\n"
+    b"*.swo\n"
+    b"\n"
+    b"# Python\n"
+    b"__pycache__/\n"
+    b"*.pyc\n"
+    b".venv/\n"
+    b"venv/\n"
+    b".env\n"
+    b"\n"
+    b"# Node\n"
+    b"node_modules/\n"
+    b"\n"
+    b"# OS\n"
+    b".DS_Store\n"
+    b"Thumbs.db\n"
+)
 
 
 def slugify(name: str) -> str:
     """Convert name to URL-friendly slug."""
-    slug = name.lower()
-    slug = re.sub(r"[^a-z0-9]+", "-", slug)
-    slug = slug.strip("-")
-    return slug
+    return _SLUG_RE.sub("-", name.lower()).strip("-")
 
 
-async def list_projects(db: Database) -> list[dict]:
-    """List all registered projects.
+async def iter_projects(db: Database) -> AsyncIterator[dict]:
+    """Yield registered projects one at a time.
 
-    Returns:
-        List of project dictionaries.
+    Yields:
+        Project dictionaries, ordered by name.
     """
-    projects = await db.get_all_projects()
-    return [
-        {
+    async for p in db.iter_projects():
+        yield {
             "project_id": p.project_id,
             "name": p.name,
             "path": p.path,
             "default_branch": p.default_branch,
             "backlog_enabled": p.backlog_enabled,
         }
-        for p in projects
-    ]
+
+
+async def list_projects(db: Database) -> list[dict]:
+    """List all registered projects.
+
+    Returns:
+        List of project dictionaries.
+    """
+    return [p async for p in iter_projects(db)]
 
 
 async def get_project(db: Database, project_id: str) -> dict | None:
@@ -64,36 +111,127 @@ async def get_project(db: Database, project_id: str) -> dict | None:
     }
 
 
-async def register_project(
-    db: Database,
+def _git_dirs(repo_path: Path) -> tuple[Path, Path]:
+    """Locate a repository's git dir and common dir without GitPython.
+
+    Handles a regular ``.git`` directory, a ``.git`` gitfile (linked worktree
+    or submodule) and a bare repository.
+
+    Returns:
+        Tuple of (git_dir, common_dir).
+    """
+    dot_git = repo_path / ".git"
+    if dot_git.is_file():
+        target = dot_git.read_text(encoding="utf-8").strip()
+        if not target.startswith("gitdir:"):
+            raise ValueError(f"Malformed gitfile: {dot_git}")
+        git_dir = (repo_path / target[7:].strip()).resolve()
+    elif dot_git.is_dir():
+        git_dir = dot_git
+    else:
+        git_dir = repo_path
+
+    commondir_file = git_dir / "commondir"
+    if commondir_file.is_file():
+        common = commondir_file.read_text(encoding="utf-8").strip()
+        return git_dir, (git_dir / common).resolve()
+    return git_dir, git_dir
+
+
+def _read_repo_info(repo_path: Path) -> tuple[str | None, str]:
+    """Read origin URL and current branch straight from the git dir files.
+
+    Returns:
+        Tuple of (remote_url, default_branch).
+    """
+    git_dir, common_dir = _git_dirs(repo_path)
+
+    # Get remote URL if available
+    remote_url = None
+    config = GitConfigParser(str(common_dir / "config"), read_only=True)
+    if config.has_section('remote "origin"'):
+        remote_url = config.get_value('remote "origin"', "url", None)
+
+    # Get default branch ("ref: refs/heads/<branch>"; detached HEAD keeps main)
+    default_branch = "main"
+    head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+    if head.startswith("ref: refs/heads/"):
+        default_branch = head[16:]
+
+    return remote_url, default_branch
+
+
+def _inspect_repo(repo_path: Path) -> tuple[str | None, str, str | None]:
+    """Read remote URL, current branch and backlog directory from a repository.
+
+    Args:
+        repo_path: Resolved repository path.
+
+    Returns:
+        Tuple of (remote_url, default_branch, backlog_path).
+
+    Raises:
+        ValueError: If path is not a valid git repository.
+    """
+    try:
+        remote_url, default_branch = _read_repo_info(repo_path)
+    except Exception:
+        # Unusual layouts: let GitPython work it out
+        try:
+            repo = Repo(repo_path)
+        except InvalidGitRepositoryError as e:
+            raise ValueError(f"Not a git repository: {repo_path}") from e
+
+        remote_url = None
+        with contextlib.suppress(Exception):
+            if repo.remotes:
+                remote_url = repo.remotes.origin.url
+
+        default_branch = "main"
+        with contextlib.suppress(Exception):
+            default_branch = repo.active_branch.name
+
+    # Check for backlog (one directory read instead of a stat per candidate)
+    backlog_dirs: dict[str, str] = {}
+    with os.scandir(repo_path) as entries:
+        for entry in entries:
+            if entry.name in _BACKLOG_DIR_NAMES and entry.is_dir():
+                backlog_dirs[entry.name] = entry.path
+                if entry.name == _BACKLOG_DIR_NAMES[0]:
+                    break  # Preferred name found, stop reading the directory
+    backlog_path = next(
+        (backlog_dirs[d] for d in _BACKLOG_DIR_NAMES if d in backlog_dirs), None
+    )
+
+    return remote_url, default_branch, backlog_path
+
+
+def _resolve_repo(
     path: str,
     name: str | None = None,
     project_id: str | None = None,
-) -> dict:
-    """Register a project (git repository).
+) -> tuple[Path, str, str]:
+    """Resolve and validate a repository path and derive its name and ID.
 
     Args:
-        db: Database instance.
-        path: Absolute path to repository.
+        path: Path to repository.
         name: Display name (defaults to directory name).
         project_id: Project ID (defaults to slugified name).
 
     Returns:
-        Created project dictionary.
+        Tuple of (resolved_path, name, project_id).
 
     Raises:
-        ValueError: If path is not a valid git repository.
+        ValueError: If path does not exist or is not a git repository.
     """
     repo_path = Path(path).expanduser().resolve()
 
     if not repo_path.exists():
         raise ValueError(f"Path does not exist: {repo_path}")
 
-    # Validate it's a git repo
-    try:
-        repo = Repo(repo_path)
-    except InvalidGitRepositoryError as e:
-        raise ValueError(f"Not a git repository: {repo_path}") from e
+    # Validate it's a git repo (cheap filesystem check, no Repo object yet)
+    if not is_git_repo(repo_path):
+        raise ValueError(f"Not a git repository: {repo_path}")
 
     # Determine name and ID
     if not name:
@@ -102,47 +240,63 @@ async def register_project(
     if not project_id:
         project_id = slugify(name)
 
-    # Check for duplicates
-    existing = await db.get_project(project_id)
-    if existing:
-        raise ValueError(f"Project with ID '{project_id}' already exists")
+    return repo_path, name, project_id
 
-    existing_path = await db.get_project_by_path(str(repo_path))
-    if existing_path:
-        raise ValueError(f"Project at path '{repo_path}' already registered")
 
-    # Get remote URL if available
-    remote_url = None
-    with contextlib.suppress(Exception):
-        if repo.remotes:
-            remote_url = repo.remotes.origin.url
+async def _build_project(repo_path: Path, name: str, project_id: str) -> Project:
+    """Inspect a validated repository and build its (unsaved) Project.
 
-    # Get default branch
-    default_branch = "main"
-    with contextlib.suppress(Exception):
-        default_branch = repo.active_branch.name
-
-    # Check for backlog
-    backlog_enabled = False
-    backlog_path = None
-    for backlog_dir in ["backlog", "Backlog", ".backlog"]:
-        candidate = repo_path / backlog_dir
-        if candidate.is_dir():
-            backlog_enabled = True
-            backlog_path = str(candidate)
-            break
-
-    # Create project
-    project = Project(
+    Duplicate checks are the caller's job, so batch callers can run them
+    once for many repositories.
+    """
+    # Inspect the repository off the event loop (GitPython is blocking)
+    remote_url, default_branch, backlog_path = await asyncio.to_thread(
+        _inspect_repo, repo_path
+    )
+
+    return Project(
         project_id=project_id,
         name=name,
         path=str(repo_path),
         remote_url=remote_url,
         default_branch=default_branch,
-        backlog_enabled=backlog_enabled,
+        backlog_enabled=backlog_path is not None,
         backlog_path=backlog_path,
     )
 
+
+async def register_project(
+    db: Database,
+    path: str,
+    name: str | None = None,
+    project_id: str | None = None,
+) -> dict:
+    """Register a project (git repository).
+
+    Args:
+        db: Database instance.
+        path: Absolute path to repository.
+        name: Display name (defaults to directory name).
+        project_id: Project ID (defaults to slugified name).
+
+    Returns:
+        Created project dictionary.
+
+    Raises:
+        ValueError: If path is not a valid git repository.
+    """
+    repo_path, name, project_id = _resolve_repo(path, name, project_id)
+
+    # Check for duplicates
+    existing = await db.get_project(project_id)
+    if existing:
+        raise ValueError(f"Project with ID '{project_id}' already exists")
+
+    existing_path = await db.get_project_by_path(str(repo_path))
+    if existing_path:
+        raise ValueError(f"Project at path '{repo_path}' already registered")
+
+    project = await _build_project(repo_path, name, project_id)
     await db.create_project(project)
 
     return {
@@ -152,73 +306,183 @@ async def register_project(
         "remote_url": project.remote_url,
         "default_branch": project.default_branch,
         "backlog_enabled": project.backlog_enabled,
-        "message": f"Project '{name}' registered successfully",
+        "message": f"Project '{project.name}' registered successfully",
     }
 
 
-async def scan_projects(db: Database, root: Path) -> dict:
-    """Scan directory for git repositories and register them.
-
-    Args:
-        db: Database instance.
-        root: Root directory to scan.
-
-    Returns:
-        Summary of scan results.
+async def _register_batch(
+    db: Database,
+    batch: list[str],
+    semaphore: asyncio.Semaphore,
+    registered: list[dict],
+    skipped: list[dict],
+    errors: list[dict],
+) -> None:
+    """Register one micro-batch of candidate repositories from a scan.
+
+    Runs one path lookup, one ID lookup and one insert per batch, and
+    appends the outcome for each candidate to the given result lists.
     """
-    found = []
-    registered = []
-    skipped = []
-    errors = []
+    # Look up already-registered paths in one query
+    existing_by_path = await db.get_projects_by_paths(batch)
+
+    resolved: list[tuple[str, Path, str, str]] = []
+    for item in batch:
+        existing = existing_by_path.get(item)
+        if existing:
+            skipped.append(
+                {
+                    "path": item,
+                    "project_id": existing.project_id,
+                    "reason": "already registered",
+                }
+            )
+            continue
+        try:
+            resolved.append((item, *_resolve_repo(item)))
+        except ValueError as e:
+            errors.append({"path": item, "error": str(e)})
+
+    # Reject taken IDs with one query instead of a lookup per repository
+    existing_by_id = await db.get_projects_by_ids([r[3] for r in resolved])
+    new_repos = []
+    for item, repo_path, name, project_id in resolved:
+        if project_id in existing_by_id:
+            errors.append(
+                {
+                    "path": item,
+                    "error": f"Project with ID '{project_id}' already exists",
+                }
+            )
+        else:
+            new_repos.append((item, repo_path, name, project_id))
 
-    # Walk one level deep (direct children of root)
-    for item in root.iterdir():
-        if item.name.startswith("."):
-            continue  # Skip hidden directories
+    # Inspect new repositories concurrently (semaphore bounds git/disk load)
+    async def build_with_semaphore(repo_path: Path, name: str, pid: str) -> Project:
+        async with semaphore:
+            return await _build_project(repo_path, name, pid)
 
-        if not item.is_dir():
-            continue
+    results = await asyncio.gather(
+        *(build_with_semaphore(*repo[1:]) for repo in new_repos),
+        return_exceptions=True,
+    )
 
-        git_dir = item / ".git"
-        if not git_dir.exists():
-            continue
+    built: list[tuple[str, Project]] = []
+    for (item, *_), result in zip(new_repos, results, strict=True):
+        if isinstance(result, BaseException):
+            errors.append(
+                {
+                    "path": item,
+                    "error": str(result),
+                }
+            )
+        else:
+            built.append((item, result))
 
-        found.append(str(item))
+    # Insert the batch in one transaction; conflicts (e.g. two directories
+    # slugifying to the same ID) are skipped by the database
+    inserted = await db.create_projects([project for _, project in built])
+    inserted_paths = {project.path for project in inserted}
 
-        try:
-            # Check if already registered
-            existing = await db.get_project_by_path(str(item))
-            if existing:
-                skipped.append(
-                    {
-                        "path": str(item),
-                        "project_id": existing.project_id,
-                        "reason": "already registered",
-                    }
-                )
-                continue
-
-            # Register it
-            result = await register_project(db, str(item))
+    for item, project in built:
+        if project.path in inserted_paths:
             registered.append(
                 {
-                    "path": str(item),
-                    "project_id": result["project_id"],
-                    "name": result["name"],
+                    "path": item,
+                    "project_id": project.project_id,
+                    "name": project.name,
                 }
             )
-
-        except Exception as e:
+        else:
             errors.append(
                 {
-                    "path": str(item),
-                    "error": str(e),
+                    "path": item,
+                    "error": (
+                        f"Project '{project.project_id}' at '{project.path}' "
+                        "already registered"
+                    ),
                 }
             )
 
+
+async def scan_projects(
+    db: Database,
+    root: Path,
+    max_concurrent: int = 8,
+    batch_size: int = 32,
+    workers: int = 2,
+) -> dict:
+    """Scan directory for git repositories and register them.
+
+    The directory walk feeds a bounded queue that worker tasks drain in
+    micro-batches, so walking, git inspection and database writes overlap
+    while memory stays bounded on roots with many children.
+
+    Args:
+        db: Database instance.
+        root: Root directory to scan.
+        max_concurrent: Max repositories inspected concurrently.
+        batch_size: Max candidates registered per database round-trip.
+        workers: Number of batch workers.
+
+    Returns:
+        Summary of scan results.
+    """
+    registered: list[dict] = []
+    skipped: list[dict] = []
+    errors: list[dict] = []
+    found = 0
+
+    queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=batch_size * 2)
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def worker() -> None:
+        done = False
+        while not done:
+            item = await queue.get()
+            if item is None:
+                break
+            batch = [item]
+            # Take whatever else arrives within a short window
+            with contextlib.suppress(TimeoutError):
+                async with asyncio.timeout(0.01):
+                    while len(batch) < batch_size:
+                        item = await queue.get()
+                        if item is None:
+                            done = True
+                            break
+                        batch.append(item)
+            await _register_batch(db, batch, semaphore, registered, skipped, errors)
+
+    async def walk() -> None:
+        nonlocal found
+        # Walk one level deep (direct children of root). DirEntry caches the
+        # file type from readdir, so only the .git probe costs a stat() call,
+        # and it works on plain strings; Paths are built only for new repos.
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if (
+                    not entry.name.startswith(".")  # Skip hidden directories
+                    and entry.is_dir()
+                    and os.path.exists(entry.path + _GIT_SUFFIX)
+                ):
+                    found += 1
+                    await queue.put(entry.path)
+        for _ in range(workers):
+            await queue.put(None)
+
+    tasks = [asyncio.create_task(walk())]
+    tasks += [asyncio.create_task(worker()) for _ in range(workers)]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        # A failed worker must not leave the walker blocked on a full queue
+        for task in tasks:
+            task.cancel()
+
     return {
         "scanned_root": str(root),
-        "found": len(found),
+        "found": found,
         "registered": len(registered),
         "skipped": len(skipped),
         "errors": len(errors),
@@ -248,8 +512,7 @@ async def unregister_project(db: Database, project_id: str) -> dict:
         raise ValueError(f"Project '{project_id}' not found")
 
     # Check for active sessions
-    sessions = await db.get_sessions_by_project(project_id)
-    active = [s for s in sessions if s.state.value != "closing"]
+    active = await db.get_sessions_by_project(project_id, include_closed=False)
     if active:
         raise ValueError(
             f"Project has {len(active)} active session(s). "
@@ -277,7 +540,10 @@ def validate_project_name(name: str) -> str | None:
         return "Project name cannot be empty"
     if len(name) > 64:
         return "Project name too long (max 64 characters)"
-    if not re.match(r"^[a-z][a-z0-9-]*$", name):
+    if _NAME_RE.match(name):
+        return None
+    # Invalid: find the specific rule that failed
+    if not _NAME_CHARS_RE.match(name):
         return "Name must be lowercase letters, numbers, dashes only"
     if name.startswith("-") or name.endswith("-"):
         return "Name cannot start or end with a dash"
@@ -286,6 +552,38 @@ def validate_project_name(name: str) -> str | None:
     return None
 
 
+@functools.cache
+def _git_env() -> dict[str, str]:
+    """Environment for git commands.
+
+    git only consults $EMAIL when user.email is not configured, so this
+    gives commits the same user@host fallback GitPython uses without
+    overriding the user's identity.
+    """
+    env = dict(os.environ)
+    env.setdefault("EMAIL", f"{getpass.getuser()}@{socket.gethostname()}")
+    return env
+
+
+def _git(cwd: Path, *args: str) -> str:
+    """Run a git command in cwd and return its stdout.
+
+    Raises:
+        ValueError: If the command fails.
+    """
+    result = subprocess.run(
+        ["git", *args],
+        capture_output=True,
+        text=True,
+        check=False,
+        cwd=cwd,
+        env=_git_env(),
+    )
+    if result.returncode != 0:
+        raise ValueError(f"git {args[0]} failed: {result.stderr.strip()}")
+    return result.stdout
+
+
 async def create_project(
     db: Database,
     projects_root: Path,
@@ -313,12 +611,13 @@ async def create_project(
 
     project_path = projects_root / name
 
-    # Check if already exists
-    if project_path.exists():
+    # Check the directory and the registry concurrently (stat off the loop)
+    path_exists, existing = await asyncio.gather(
+        asyncio.to_thread(project_path.exists),
+        db.get_project(name),
+    )
+    if path_exists:
         raise ValueError(f"Directory already exists: {project_path}")
-
-    # Check if already registered
-    existing = await db.get_project(name)
     if existing:
         raise ValueError(f"Project '{name}' already registered")
 
@@ -327,7 +626,7 @@ async def create_project(
 
     try:
         # Initialize git repo with main branch
-        repo = Repo.init(project_path, initial_branch="main")
+        _git(project_path, "init", "-q", "-b", "main")
 
         # Create README.md
         readme = project_path / "README.md"
@@ -335,40 +634,28 @@ async def create_project(
 
         # Create .gitignore
         gitignore = project_path / ".gitignore"
-        gitignore.write_text(
-            "# IDE\n"
-            ".idea/\n"
-            ".vscode/\n"
-            "*.swp\n"
-            "*.swo\n"
-            "\n"
-            "# Python\n"
-            "__pycache__/\n"
-            "*.pyc\n"
-            ".venv/\n"
-            "venv/\n"
-            ".env\n"
-            "\n"
-            "# Node\n"
-            "node_modules/\n"
-            "\n"
-            "# OS\n"
-            ".DS_Store\n"
-            "Thumbs.db\n"
+        gitignore.write_bytes(_GITIGNORE_BYTES)
+
+        # Initial commit (git builds the index and tree natively)
+        _git(project_path, "add", "README.md", ".gitignore")
+        _git(
+            project_path,
+            "commit",
+            "-q",
+            "--no-verify",
+            "--no-gpg-sign",
+            "-m",
+            "Initial commit",
         )
 
-        # Initial commit
-        repo.index.add(["README.md", ".gitignore"])
-        repo.index.commit("Initial commit")
-
         # Create remote if requested
         remote_url = None
         if remote:
             remote_url = _create_remote(project_path, name, remote)
             if remote_url:
-                repo.create_remote("origin", remote_url)
+                _git(project_path, "remote", "add", "origin", remote_url)
                 # Push to remote
-                repo.remotes.origin.push("main", set_upstream=True)
+                _git(project_path, "push", "-q", "-u", "origin", "main")
 
         # Register in database
         project = Project(
@@ -394,13 +681,34 @@ async def create_project(
 
     except Exception as e:
         # Clean up on failure
-        import shutil
-
         if project_path.exists():
             shutil.rmtree(project_path)
         raise ValueError(f"Failed to create project: {e}") from e
 
 
+# Resolved CLI executables; misses are not cached so a CLI installed while
+# the server runs is picked up on the next call
+_cli_paths: dict[str, str] = {}
+
+
+def _find_cli(name: str) -> str | None:
+    """Locate a CLI executable on PATH (cached after the first hit)."""
+    path = _cli_paths.get(name)
+    if path is None:
+        path = shutil.which(name)
+        if path is not None:
+            _cli_paths[name] = path
+    return path
+
+
+def _extract_url(output: str) -> str | None:
+    """Extract the first https:// or git@ URL from CLI output."""
+    for part in output.split():
+        if part.startswith(("https://", "git@")):
+            return part.rstrip(".")
+    return None
+
+
 def _create_remote(project_path: Path, name: str, remote: str) -> str | None:
     """Create a remote repository on GitHub or GitLab.
 
@@ -417,17 +725,15 @@ def _create_remote(project_path: Path, name: str, remote: str) -> str | None:
     """
     if remote == "github":
         # Check if gh CLI is available
-        result = subprocess.run(
-            ["which", "gh"], capture_output=True, text=True, check=False
-        )
-        if result.returncode != 0:
+        gh = _find_cli("gh")
+        if not gh:
             raise ValueError(
                 "GitHub CLI (gh) not found. Install with: brew install gh"
             )
 
         # Create repo
         result = subprocess.run(
-            ["gh", "repo", "create", name, "--private", "--source", str(project_path)],
+            [gh, "repo", "create", name, "--private", "--source", str(project_path)],
             capture_output=True,
             text=True,
             check=False,
@@ -436,32 +742,20 @@ def _create_remote(project_path: Path, name: str, remote: str) -> str | None:
         if result.returncode != 0:
             raise ValueError(f"Failed to create GitHub repo: {result.stderr}")
 
-        # Get repo URL
-        result = subprocess.run(
-            ["gh", "repo", "view", "--json", "url", "-q", ".url"],
-            capture_output=True,
-            text=True,
-            check=False,
-            cwd=project_path,
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
-
-        return None
+        # gh prints the new repo URL on stdout, no need for `gh repo view`
+        return _extract_url(result.stdout)
 
     elif remote == "gitlab":
         # Check if glab CLI is available
-        result = subprocess.run(
-            ["which", "glab"], capture_output=True, text=True, check=False
-        )
-        if result.returncode != 0:
+        glab = _find_cli("glab")
+        if not glab:
             raise ValueError(
                 "GitLab CLI (glab) not found. Install with: brew install glab"
             )
 
         # Create repo
         result = subprocess.run(
-            ["glab", "repo", "create", name, "--private"],
+            [glab, "repo", "create", name, "--private"],
             capture_output=True,
             text=True,
             check=False,
@@ -472,14 +766,7 @@ def _create_remote(project_path: Path, name: str, remote: str) -> str | None:
 
         # Get repo URL from output (glab outputs it)
         # Format: "Created repository user/name on GitLab: https://..."
-        for line in result.stdout.split("\n"):
-            if "https://" in line or "git@" in line:
-                # Extract URL
-                parts = line.split()
-                for part in parts:
-                    if part.startswith("https://") or part.startswith("git@"):
-                        return part.rstrip(".")
-        return None
+        return _extract_url(result.stdout)
 
     else:
         raise ValueError(f"Unknown remote type: {remote}. Use 'github' or 'gitlab'.")
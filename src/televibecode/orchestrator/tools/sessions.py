@@ -1,12 +1,77 @@
 """MCP tools for session management."""
 
+import asyncio
+import os
 import shutil
+from collections.abc import AsyncIterator
+from operator import attrgetter
 from pathlib import Path
+from uuid import uuid4
+
+import structlog
 
 from televibecode.config import Settings
 from televibecode.db import Database, Session, SessionState
+from televibecode.db.cache import TTLCache
 from televibecode.db.models import ExecutionMode
-from televibecode.orchestrator.tools.git_ops import GitOperations
+from televibecode.orchestrator.tools.git_ops import GitOperations, get_git_ops
+
+log = structlog.get_logger()
+
+# Strong references to background work (the loop only keeps weak ones)
+_background_tasks: set[asyncio.Task] = set()
+
+# In-flight worktree setups by session ID, so closing can wait for them
+_setup_tasks: dict[str, asyncio.Task] = {}
+
+# Recent get_branch_status() results keyed by workspace path
+_git_status_cache: TTLCache[dict] = TTLCache(maxsize=256, ttl=5.0)
+
+# Fields copied into each list_sessions row, fetched in one C-level call
+_SESSION_LIST_FIELDS = attrgetter(
+    "session_id",
+    "project_id",
+    "display_name",
+    "branch",
+    "state",
+    "execution_mode",
+    "workspace_path",
+    "current_job_id",
+    "last_activity_at_iso",
+)
+
+
+async def iter_sessions(
+    db: Database,
+    project_id: str | None = None,
+    include_closed: bool = False,
+) -> AsyncIterator[dict]:
+    """Yield sessions one at a time, optionally filtered by project.
+
+    Args:
+        db: Database instance.
+        project_id: Optional project filter.
+        include_closed: If True, include closing sessions.
+
+    Yields:
+        Session dictionaries.
+    """
+    async for s, project_name in db.stream_sessions(project_id, include_closed):
+        sid, pid, name, branch, state, mode, path, job_id, active = (
+            _SESSION_LIST_FIELDS(s)
+        )
+        yield {
+            "session_id": sid,
+            "project_id": pid,
+            "project_name": project_name,
+            "display_name": name,
+            "branch": branch,
+            "state": state.value,
+            "execution_mode": mode.value,
+            "workspace_path": path,
+            "current_job_id": job_id,
+            "last_activity_at": active,
+        }
 
 
 async def list_sessions(
@@ -24,28 +89,7 @@ async def list_sessions(
     Returns:
         List of session dictionaries.
     """
-    if project_id:
-        sessions = await db.get_sessions_by_project(project_id)
-    elif include_closed:
-        sessions = await db.get_all_sessions()
-    else:
-        sessions = await db.get_active_sessions()
-
-    return [
-        {
-            "session_id": s.session_id,
-            "project_id": s.project_id,
-            "display_name": s.display_name,
-            "branch": s.branch,
-            "state": s.state.value,
-            "execution_mode": s.execution_mode.value,
-            "workspace_path": s.workspace_path,
-            "current_job_id": s.current_job_id,
-            "last_activity_at": s.last_activity_at.isoformat(),
-        }
-        for s in sessions
-        if include_closed or s.state != SessionState.CLOSING
-    ]
+    return [s async for s in iter_sessions(db, project_id, include_closed)]
 
 
 async def get_session(db: Database, session_id: str) -> dict | None:
@@ -58,7 +102,7 @@ async def get_session(db: Database, session_id: str) -> dict | None:
     Returns:
         Session dictionary or None if not found.
     """
-    session = await db.get_session(session_id)
+    session = await db.get_session_cached(session_id)
     if not session:
         return None
 
@@ -77,8 +121,8 @@ async def get_session(db: Database, session_id: str) -> dict | None:
         "last_summary": session.last_summary,
         "last_diff": session.last_diff,
         "open_pr": session.open_pr,
-        "last_activity_at": session.last_activity_at.isoformat(),
-        "created_at": session.created_at.isoformat(),
+        "last_activity_at": session.last_activity_at_iso,
+        "created_at": session.created_at_iso,
     }
 
 
@@ -89,6 +133,7 @@ async def create_session(
     branch: str | None = None,
     display_name: str | None = None,
     execution_mode: ExecutionMode = ExecutionMode.WORKTREE,
+    subdirs: list[str] | None = None,
 ) -> dict:
     """Create a new session.
 
@@ -99,6 +144,8 @@ async def create_session(
         branch: Optional branch name (auto-generated if not provided for worktree).
         display_name: Optional display name for the session.
         execution_mode: WORKTREE (isolated worktree) or DIRECT (project folder).
+        subdirs: Optional directories to check out (sparse worktree); the rest
+            of the repository is not materialized.
 
     Returns:
         Created session dictionary.
@@ -107,7 +154,7 @@ async def create_session(
         ValueError: If project not found or creation fails.
     """
     # Get project
-    project = await db.get_project(project_id)
+    project = await db.get_project_cached(project_id)
     if not project:
         raise ValueError(f"Project '{project_id}' not found")
 
@@ -117,9 +164,12 @@ async def create_session(
     now = datetime.now()
     session_id = f"{project_id}_{now.strftime('%Y%m%d_%H%M%S')}"
 
-    git_ops = GitOperations(project.path)
+    git_ops = get_git_ops(project.path)
 
     if execution_mode == ExecutionMode.DIRECT:
+        if subdirs:
+            raise ValueError("Sparse checkout (subdirs) requires worktree mode")
+
         # Direct mode: run in project folder directly
         workspace_path = Path(project.path)
 
@@ -128,16 +178,12 @@ async def create_session(
             branch = git_ops.get_current_branch()
 
         # Check for existing direct sessions on same project
-        existing_sessions = await db.get_sessions_by_project(project_id)
-        for existing in existing_sessions:
-            if (
-                existing.execution_mode == ExecutionMode.DIRECT
-                and existing.state != SessionState.CLOSING
-            ):
-                raise ValueError(
-                    f"Project '{project_id}' already has an active direct session "
-                    f"'{existing.session_id}'. Close it first or use worktree mode."
-                )
+        existing = await db.get_active_direct_session(project_id)
+        if existing:
+            raise ValueError(
+                f"Project '{project_id}' already has an active direct session "
+                f"'{existing.session_id}'. Close it first or use worktree mode."
+            )
 
         # Create session in database
         session = Session(
@@ -173,46 +219,50 @@ async def create_session(
         branch = f"televibe/{session_id}"
 
     # Check for duplicate branch sessions
-    existing_sessions = await db.get_sessions_by_project(project_id)
-    for existing in existing_sessions:
-        if existing.branch == branch and existing.state != SessionState.CLOSING:
-            raise ValueError(
-                f"Branch '{branch}' is already in use by session "
-                f"'{existing.session_id}'. Close that session first or "
-                "use a different branch."
-            )
+    existing = await db.get_session_by_branch(project_id, branch)
+    if existing:
+        raise ValueError(
+            f"Branch '{branch}' is already in use by session "
+            f"'{existing.session_id}'. Close that session first or "
+            "use a different branch."
+        )
 
     # Set up worktree path
     workspace_path = settings.workspaces_dir / session_id
-    if workspace_path.exists():
+    if await asyncio.to_thread(workspace_path.exists):
         raise ValueError(f"Workspace path already exists: {workspace_path}")
 
-    # Check if branch exists
-    branch_exists = git_ops.branch_exists(branch)
-
-    try:
-        git_ops.create_worktree(
-            worktree_path=workspace_path,
-            branch=branch,
-            create_branch=not branch_exists,
-            base_branch=project.default_branch,
-        )
-    except Exception as e:
-        raise ValueError(f"Failed to create worktree: {e}") from e
-
-    # Create session in database
+    # Insert the session first and materialize the worktree in the
+    # background, so the caller is not blocked on checkout
     session = Session(
         session_id=session_id,
         project_id=project_id,
         display_name=display_name,
         workspace_path=str(workspace_path),
         branch=branch,
-        state=SessionState.IDLE,
+        state=SessionState.CREATING,
         execution_mode=ExecutionMode.WORKTREE,
+        sparse_paths=subdirs or None,
     )
 
     await db.create_session(session)
 
+    task = asyncio.create_task(
+        _materialize_worktree(
+            db,
+            git_ops,
+            session_id,
+            workspace_path,
+            branch,
+            project.default_branch,
+            project.path,
+            subdirs or None,
+        ),
+        name=f"worktree:{session_id}",
+    )
+    _setup_tasks[session_id] = task
+    task.add_done_callback(lambda _: _setup_tasks.pop(session_id, None))
+
     return {
         "session_id": session.session_id,
         "project_id": project_id,
@@ -221,13 +271,55 @@ async def create_session(
         "branch": branch,
         "workspace_path": str(workspace_path),
         "execution_mode": "worktree",
+        "sparse_paths": session.sparse_paths,
         "state": session.state.value,
         "message": (
-            f"Session {session_id} created for {project.name} on branch {branch}"
+            f"Session {session_id} created for {project.name} on branch {branch}; "
+            "setting up its worktree"
         ),
     }
 
 
+async def _materialize_worktree(
+    db: Database,
+    git_ops: GitOperations,
+    session_id: str,
+    workspace_path: Path,
+    branch: str,
+    base_branch: str,
+    reference_path: str,
+    sparse_paths: list[str] | None,
+) -> None:
+    """Create a session's worktree and move the session out of CREATING.
+
+    The session becomes IDLE on success, or FAILED with the error stored in
+    ``last_summary``.
+    """
+
+    def create() -> None:
+        git_ops.create_worktree(
+            worktree_path=workspace_path,
+            branch=branch,
+            create_branch=not git_ops.branch_exists(branch),
+            base_branch=base_branch,
+            reference_path=reference_path,
+            sparse_paths=sparse_paths,
+        )
+
+    try:
+        await asyncio.to_thread(create)
+    except Exception as e:
+        log.error("worktree_create_failed", session_id=session_id, error=str(e))
+        session = await db.get_session(session_id)
+        if session:
+            session.state = SessionState.FAILED
+            session.last_summary = f"Failed to create worktree: {e}"
+            await db.update_session(session)
+        return
+
+    await db.update_session_state(session_id, SessionState.IDLE)
+
+
 async def get_session_branch_status(
     db: Database,
     session_id: str,
@@ -241,11 +333,11 @@ async def get_session_branch_status(
     Returns:
         Dictionary with branch status info.
     """
-    session = await db.get_session(session_id)
-    if not session:
+    pair = await db.get_session_with_project(session_id)
+    if not pair:
         raise ValueError(f"Session '{session_id}' not found")
+    session, project = pair
 
-    project = await db.get_project(session.project_id)
     if not project:
         return {
             "session_id": session_id,
@@ -255,20 +347,22 @@ async def get_session_branch_status(
 
     # Get branch drift info
     workspace_path = Path(session.workspace_path)
-    if not workspace_path.exists():
+    if not await asyncio.to_thread(workspace_path.exists):
         return {
             "session_id": session_id,
             "branch": session.branch,
             "workspace_missing": True,
         }
 
-    git_ops = GitOperations(project.path)
+    git_ops = get_git_ops(project.path)
 
-    # Get working directory status
-    work_status = git_ops.get_branch_status(workspace_path)
-
-    # Get drift from main
-    drift = git_ops.get_branch_drift(session.branch, worktree_path=workspace_path)
+    # Get working directory status and drift from main concurrently
+    work_status, drift = await asyncio.gather(
+        asyncio.to_thread(git_ops.get_branch_status, workspace_path),
+        asyncio.to_thread(
+            git_ops.get_branch_drift, session.branch, worktree_path=workspace_path
+        ),
+    )
 
     return {
         "session_id": session_id,
@@ -289,16 +383,87 @@ async def get_session_branch_status(
     }
 
 
+async def _discard_workspace(
+    workspace_path: Path,
+    session_id: str,
+    settings: Settings,
+) -> None:
+    """Move a workspace out of the way and delete it in the background.
+
+    The folder is renamed into the trash directory (cheap, same filesystem),
+    then removed by settings.worktree_remover or an rmtree in a worker thread.
+    Falls back to deleting in place if the rename is not possible.
+    """
+    trash_dir = settings.trash_dir
+    trashed = trash_dir / f"{session_id}-{uuid4().hex}"
+    try:
+        await asyncio.to_thread(trash_dir.mkdir, parents=True, exist_ok=True)
+        await asyncio.to_thread(os.rename, workspace_path, trashed)
+    except OSError as e:
+        log.warning("workspace_trash_failed", path=str(workspace_path), error=str(e))
+        await asyncio.to_thread(shutil.rmtree, workspace_path)
+        return
+
+    _schedule_delete(trashed, settings.worktree_remover)
+
+
+def _schedule_delete(path: Path, remover: list[str] | None) -> None:
+    task = asyncio.create_task(_delete_trashed(path, remover))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def empty_trash(settings: Settings) -> int:
+    """Delete workspaces left in the trash directory (e.g. after a crash).
+
+    Deletion runs in the background, like for a forced close.
+
+    Args:
+        settings: Application settings.
+
+    Returns:
+        Number of trashed workspaces scheduled for deletion.
+    """
+
+    def list_trash() -> list[Path]:
+        if not settings.trash_dir.is_dir():
+            return []
+        return list(settings.trash_dir.iterdir())
+
+    leftovers = await asyncio.to_thread(list_trash)
+    for path in leftovers:
+        _schedule_delete(path, settings.worktree_remover)
+    return len(leftovers)
+
+
+async def _delete_trashed(path: Path, remover: list[str] | None) -> None:
+    """Delete a trashed workspace with the configured remover or rmtree."""
+    if remover:
+        try:
+            proc = await asyncio.create_subprocess_exec(*remover, str(path))
+            if await proc.wait() == 0:
+                return
+            log.warning("worktree_remover_failed", path=str(path), code=proc.returncode)
+        except OSError as e:
+            log.warning("worktree_remover_failed", path=str(path), error=str(e))
+    await asyncio.to_thread(shutil.rmtree, path, ignore_errors=True)
+
+
 async def close_session(
     db: Database,
+    settings: Settings,
     session_id: str,
     force: bool = False,
     delete_branch: bool = False,
 ) -> dict:
     """Close a session and clean up its worktree (if applicable).
 
+    Forced closes move the worktree into the trash directory and delete it in
+    the background, so the call returns without waiting on the file count.
+
     Args:
         db: Database instance.
+        settings: Application settings (trash dir and remover command).
         session_id: Session to close.
         force: If True, force close even with uncommitted changes.
         delete_branch: If True, also delete the git branch (worktree mode only).
@@ -309,9 +474,10 @@ async def close_session(
     Raises:
         ValueError: If session not found or has running jobs.
     """
-    session = await db.get_session(session_id)
-    if not session:
+    pair = await db.get_session_with_project(session_id)
+    if not pair:
         raise ValueError(f"Session '{session_id}' not found")
+    session, project = pair
 
     # Check for running jobs
     if session.state == SessionState.RUNNING and not force:
@@ -320,15 +486,25 @@ async def close_session(
             "Wait for it to complete or use force=True."
         )
 
-    # Get project for git operations
-    project = await db.get_project(session.project_id)
+    if session.state == SessionState.CREATING and not force:
+        raise ValueError(
+            f"Session {session_id} is still being set up. "
+            "Wait for its worktree to be ready or use force=True."
+        )
+
+    # A forced close must not race the setup thread: let it finish first so
+    # the worktree it creates is removed below rather than orphaned
+    setup = _setup_tasks.get(session_id)
+    if setup:
+        await asyncio.shield(setup)
+
     if not project:
         # Project was deleted, just clean up the session
         # Only remove workspace if worktree mode
         if session.execution_mode == ExecutionMode.WORKTREE:
             workspace_path = Path(session.workspace_path)
-            if workspace_path.exists():
-                shutil.rmtree(workspace_path)
+            if await asyncio.to_thread(workspace_path.exists):
+                await _discard_workspace(workspace_path, session_id, settings)
         await db.delete_session(session_id)
         return {
             "session_id": session_id,
@@ -343,21 +519,25 @@ async def close_session(
     if session.execution_mode == ExecutionMode.WORKTREE:
         # Remove worktree
         workspace_path = Path(session.workspace_path)
-
-        if workspace_path.exists():
-            git_ops = GitOperations(project.path)
+        workspace_exists = await asyncio.to_thread(workspace_path.exists)
+        if workspace_exists or delete_branch:
+            git_ops = get_git_ops(project.path)
+
+        if workspace_exists and force:
+            # Nothing to preserve: trash the folder, then let git forget it
+            # (prune must run before the branch can be deleted)
+            await _discard_workspace(workspace_path, session_id, settings)
+            await asyncio.to_thread(git_ops.prune_worktrees)
+            worktree_removed = True
+        elif workspace_exists:
             try:
-                git_ops.remove_worktree(workspace_path, force=force)
+                await asyncio.to_thread(git_ops.remove_worktree, workspace_path)
                 worktree_removed = True
             except Exception:
-                # Fall back to manual removal
-                if force:
-                    shutil.rmtree(workspace_path)
-                    worktree_removed = True
+                log.warning("worktree_remove_failed", session_id=session_id)
 
         # Optionally delete the branch (only for worktree sessions)
         if delete_branch and project:
-            git_ops = GitOperations(project.path)
             try:
                 git_ops.delete_branch(session.branch, force=force)
                 branch_deleted = True
@@ -365,11 +545,8 @@ async def close_session(
                 # Branch deletion failed, but session still closes
                 pass
 
-    # Update session state
-    session.state = SessionState.CLOSING
-    await db.update_session(session)
-
-    # Delete session from database
+    # Delete session from database (no interim CLOSING write: nothing can
+    # observe it between the two statements)
     await db.delete_session(session_id)
 
     return {
@@ -387,26 +564,49 @@ async def close_session(
 async def push_session_branch(
     db: Database,
     session_id: str,
+    wait: bool = True,
 ) -> dict:
     """Push the session's branch to origin.
 
     Args:
         db: Database instance.
         session_id: Session whose branch to push.
+        wait: If True, wait for the push. Otherwise it runs in the
+            background and its result is recorded on the session
+            (see ``last_push_result`` in get_session_status).
 
     Returns:
-        Dictionary with push result.
+        Dictionary with push result. When not waiting, ``pushed`` is None
+        and ``pending`` is True.
     """
-    session = await db.get_session(session_id)
-    if not session:
+    pair = await db.get_session_with_project(session_id)
+    if not pair:
         raise ValueError(f"Session '{session_id}' not found")
+    session, project = pair
 
-    project = await db.get_project(session.project_id)
     if not project:
         raise ValueError(f"Project '{session.project_id}' not found")
 
-    git_ops = GitOperations(project.path)
-    result = git_ops.push_branch(session.branch)
+    git_ops = get_git_ops(project.path)
+
+    if not wait:
+        await db.set_session_push_result(
+            session_id, {"branch": session.branch, "pushed": None, "pending": True}
+        )
+        task = asyncio.create_task(
+            _push_and_record(db, git_ops, session_id, session.branch)
+        )
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+        return {
+            "session_id": session_id,
+            "branch": session.branch,
+            "pushed": None,
+            "pending": True,
+            "error": None,
+        }
+
+    result = await _push_and_record(db, git_ops, session_id, session.branch)
 
     return {
         "session_id": session_id,
@@ -416,6 +616,24 @@ async def push_session_branch(
     }
 
 
+async def _push_and_record(
+    db: Database,
+    git_ops: GitOperations,
+    session_id: str,
+    branch: str,
+) -> dict:
+    """Push a branch (in a thread) and record the result on the session."""
+    try:
+        result = await asyncio.to_thread(git_ops.push_branch, branch)
+    except Exception as e:
+        # push_branch only reports GitCommandError; never leave it pending
+        result = {"branch": branch, "pushed": False, "error": str(e)}
+    if not result.get("pushed"):
+        log.warning("session_push_failed", session_id=session_id, **result)
+    await db.set_session_push_result(session_id, result)
+    return result
+
+
 async def update_session_state(
     db: Database,
     session_id: str,
@@ -451,50 +669,48 @@ async def update_session_state(
 async def get_session_status(
     db: Database,
     session_id: str,
+    detailed: bool = False,
 ) -> dict:
     """Get detailed session status including git status.
 
+    Git status is served from a short-lived per-workspace cache so frequent
+    polling doesn't run ``git status`` each time.
+
     Args:
         db: Database instance.
         session_id: Session to check.
+        detailed: If True, always read fresh git status (and refresh the cache).
 
     Returns:
         Status dictionary with session and git info.
     """
-    session = await db.get_session(session_id)
-    if not session:
+    pair = await db.get_session_with_project(session_id)
+    if not pair:
         raise ValueError(f"Session '{session_id}' not found")
+    session, project = pair
 
-    project = await db.get_project(session.project_id)
     if not project:
         raise ValueError(f"Project '{session.project_id}' not found")
 
-    # Get git status
-    workspace_path = Path(session.workspace_path)
-    git_status = None
-
-    if workspace_path.exists():
+    def read_git_status() -> dict | None:
+        if not Path(session.workspace_path).exists():
+            return None
         try:
-            git_ops = GitOperations(session.workspace_path)
-            git_status = git_ops.get_branch_status()
+            return get_git_ops(project.path).get_branch_status(session.workspace_path)
         except Exception as e:
-            git_status = {"error": str(e)}
-
-    # Get recent jobs
-    jobs = await db.get_jobs_by_session(session_id, limit=5)
-    recent_jobs = []
-    for j in jobs:
-        instr = j.instruction
-        if len(instr) > 50:
-            instr = instr[:50] + "..."
-        recent_jobs.append(
-            {
-                "job_id": j.job_id,
-                "status": j.status.value,
-                "instruction": instr,
-                "created_at": j.created_at.isoformat(),
-            }
+            return {"error": str(e)}
+
+    git_status = None if detailed else _git_status_cache.get(session.workspace_path)
+    if git_status is None:
+        # Get git status (in a thread) while fetching recent jobs
+        git_status, recent_jobs = await asyncio.gather(
+            asyncio.to_thread(read_git_status),
+            db.get_job_summaries_by_session(session_id, limit=5),
         )
+        if git_status is not None:
+            _git_status_cache.set(session.workspace_path, git_status)
+    else:
+        recent_jobs = await db.get_job_summaries_by_session(session_id, limit=5)
 
     return {
         "session_id": session_id,
@@ -510,6 +726,7 @@ async def get_session_status(
         "current_job_id": session.current_job_id,
         "last_summary": session.last_summary,
         "attached_tasks": session.attached_task_ids,
+        "last_push_result": session.last_push_result,
     }
 
 
@@ -528,7 +745,7 @@ async def attach_task(
     Returns:
         Result dictionary.
     """
-    session = await db.get_session(session_id)
+    session = await db.get_session_cached(session_id)
     if not session:
         raise ValueError(f"Session '{session_id}' not found")
 
@@ -536,7 +753,8 @@ async def attach_task(
     if not task:
         raise ValueError(f"Task '{task_id}' not found")
 
-    if task_id in session.attached_task_ids:
+    # Attach and point the task at the session in one transaction
+    if not await db.attach_task_to_session(session_id, task_id, session.branch):
         return {
             "session_id": session_id,
             "task_id": task_id,
@@ -544,14 +762,6 @@ async def attach_task(
             "note": "Task already attached",
         }
 
-    session.attached_task_ids.append(task_id)
-    await db.update_session(session)
-
-    # Also update task with session reference
-    task.session_id = session_id
-    task.branch = session.branch
-    await db.update_task(task)
-
     return {
         "session_id": session_id,
         "task_id": task_id,
@@ -575,11 +785,12 @@ async def detach_task(
     Returns:
         Result dictionary.
     """
-    session = await db.get_session(session_id)
+    session = await db.get_session_cached(session_id)
     if not session:
         raise ValueError(f"Session '{session_id}' not found")
 
-    if task_id not in session.attached_task_ids:
+    # Detach and clear the task's session reference in one transaction
+    if not await db.detach_task_from_session(session_id, task_id):
         return {
             "session_id": session_id,
             "task_id": task_id,
@@ -587,15 +798,6 @@ async def detach_task(
             "note": "Task not attached to this session",
         }
 
-    session.attached_task_ids.remove(task_id)
-    await db.update_session(session)
-
-    # Also clear task's session reference
-    task = await db.get_task(task_id)
-    if task and task.session_id == session_id:
-        task.session_id = None
-        await db.update_task(task)
-
     return {
         "session_id": session_id,
         "task_id": task_id,
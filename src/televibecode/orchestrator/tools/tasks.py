@@ -1,9 +1,14 @@
 """MCP tools for task management."""
 
+import asyncio
+import re
 from pathlib import Path
 
 from televibecode.backlog import scan_backlog_directory, task_to_markdown
-from televibecode.db import Database, TaskStatus
+from televibecode.db import Database, Task, TaskStatus
+
+# Anything but word characters (isalnum() or "_"), hyphens and spaces
+_UNSAFE_TITLE_CHARS = re.compile(r"[^\w\- ]")
 
 
 async def sync_backlog(
@@ -27,46 +32,47 @@ async def sync_backlog(
         raise ValueError(f"Project '{project_id}' does not have backlog enabled")
 
     backlog_path = Path(project.backlog_path)
-    if not backlog_path.exists():
+    if not await asyncio.to_thread(backlog_path.exists):
         raise ValueError(f"Backlog path does not exist: {backlog_path}")
 
-    # Parse tasks from backlog
-    parsed_tasks = scan_backlog_directory(backlog_path, project_id)
+    # Parse tasks from backlog (file reads stay off the event loop)
+    parsed_tasks = await asyncio.to_thread(
+        scan_backlog_directory, backlog_path, project_id
+    )
 
     # Get existing tasks
     existing_tasks = await db.get_tasks_by_project(project_id)
-    existing_ids = {t.task_id for t in existing_tasks}
+    existing_by_id = {t.task_id: t for t in existing_tasks}
 
-    created = 0
-    updated = 0
+    to_create: list[Task] = []
+    to_update: list[Task] = []
     unchanged = 0
 
     for task in parsed_tasks:
-        if task.task_id in existing_ids:
-            # Update existing task
-            existing = await db.get_task(task.task_id)
-            if existing:
-                # Only update if changed
-                if (
-                    existing.title != task.title
-                    or existing.status != task.status
-                    or existing.priority != task.priority
-                ):
-                    existing.title = task.title
-                    existing.description = task.description
-                    existing.status = task.status
-                    existing.priority = task.priority
-                    existing.epic = task.epic
-                    existing.assignee = task.assignee
-                    existing.tags = task.tags
-                    await db.update_task(existing)
-                    updated += 1
-                else:
-                    unchanged += 1
+        existing = existing_by_id.get(task.task_id)
+        if existing is None:
+            to_create.append(task)
+        # Only update if changed
+        elif (
+            existing.title != task.title
+            or existing.status != task.status
+            or existing.priority != task.priority
+        ):
+            existing.title = task.title
+            existing.description = task.description
+            existing.status = task.status
+            existing.priority = task.priority
+            existing.epic = task.epic
+            existing.assignee = task.assignee
+            existing.tags = task.tags
+            to_update.append(existing)
         else:
-            # Create new task
-            await db.create_task(task)
-            created += 1
+            unchanged += 1
+
+    # One transaction (one commit) for the whole sync
+    await db.bulk_save_tasks(to_create, to_update)
+    created = len(to_create)
+    updated = len(to_update)
 
     return {
         "project_id": project_id,
@@ -101,11 +107,9 @@ async def list_project_tasks(
         except ValueError:
             valid = [s.value for s in TaskStatus]
             raise ValueError(f"Invalid status '{status}'. Valid: {valid}") from None
-        tasks = await db.get_tasks_by_project(project_id)
-        tasks = [t for t in tasks if t.status == status_enum][:limit]
+        tasks = await db.get_tasks_by_project(project_id, status_enum, limit)
     else:
-        tasks = await db.get_tasks_by_project(project_id)
-        tasks = tasks[:limit]
+        tasks = await db.get_tasks_by_project(project_id, limit=limit)
 
     return [
         {
@@ -136,19 +140,7 @@ async def get_next_tasks(
     Returns:
         List of prioritized task dictionaries.
     """
-    tasks = await db.get_pending_tasks(project_id, limit=limit)
-
-    return [
-        {
-            "task_id": t.task_id,
-            "title": t.title,
-            "status": t.status.value,
-            "priority": t.priority.value,
-            "epic": t.epic,
-            "description": t.description[:200] if t.description else None,
-        }
-        for t in tasks
-    ]
+    return await db.get_pending_task_summaries(project_id, limit=limit)
 
 
 async def claim_task(
@@ -180,17 +172,23 @@ async def claim_task(
             f"Task '{task_id}' already claimed by session '{task.session_id}'"
         )
 
-    # Update task
-    task.session_id = session_id
-    task.branch = session.branch
-    if task.status == TaskStatus.TODO:
-        task.status = TaskStatus.IN_PROGRESS
-    await db.update_task(task)
-
-    # Update session
-    if task_id not in session.attached_task_ids:
-        session.attached_task_ids.append(task_id)
-        await db.update_session(session)
+    # Update task (re-claims that change nothing skip the write)
+    if (
+        task.session_id != session_id
+        or task.branch != session.branch
+        or task.status == TaskStatus.TODO
+    ):
+        task.session_id = session_id
+        task.branch = session.branch
+        if task.status == TaskStatus.TODO:
+            task.status = TaskStatus.IN_PROGRESS
+        await db.update_task(task)
+
+    # Attach to the session (a no-op if already attached); the task row
+    # was written above
+    await db.attach_task_to_session(
+        session_id, task_id, session.branch, point_task=False
+    )
 
     return {
         "task_id": task_id,
@@ -295,18 +293,18 @@ async def write_task_to_backlog(
         raise ValueError("Project backlog not configured")
 
     backlog_path = Path(project.backlog_path)
-    if not backlog_path.exists():
+    if not await asyncio.to_thread(backlog_path.exists):
         raise ValueError(f"Backlog path does not exist: {backlog_path}")
 
     # Generate filename
-    safe_title = "".join(c if c.isalnum() or c in "-_ " else "" for c in task.title)
+    safe_title = _UNSAFE_TITLE_CHARS.sub("", task.title)
     safe_title = safe_title.replace(" ", "-").lower()[:50]
     filename = f"{task.task_id}-{safe_title}.md"
 
     # Write file
     file_path = backlog_path / filename
     content = task_to_markdown(task)
-    file_path.write_text(content, encoding="utf-8")
+    await asyncio.to_thread(file_path.write_text, content, encoding="utf-8")
 
     return {
         "task_id": task_id,
@@ -3,6 +3,8 @@
 from televibecode.runner.executor import (
     JobExecutor,
     JobProgress,
+    cancel_running_job,
+    get_job_executor,
     get_job_logs,
     get_job_summary,
     list_session_jobs,
@@ -97,6 +99,8 @@ __all__ = [
     # Subprocess executor
     "JobExecutor",
     "JobProgress",
+    "cancel_running_job",
+    "get_job_executor",
     "get_job_logs",
     "get_job_summary",
     "list_session_jobs",
@@ -4,9 +4,50 @@ Provides session and project context to enhance instructions so Claude
 knows where it is working and what mode it's operating in.
 """
 
+from functools import lru_cache
+
 from televibecode.db.models import ExecutionMode, Project, Session
 
 
+@lru_cache(maxsize=256)
+def _context_prefix(
+    session_id: str,
+    project_name: str,
+    project_id: str,
+    branch: str,
+    execution_mode: ExecutionMode,
+    workspace_path: str,
+) -> str:
+    """Build the context block; memoized since it only depends on its args."""
+    mode_desc = (
+        "isolated worktree (safe for experiments)"
+        if execution_mode == ExecutionMode.WORKTREE
+        else "project folder directly (changes affect main project)"
+    )
+
+    return f"""# TeleVibeCode Session Context
+- Session: {session_id}
+- Project: {project_name} ({project_id})
+- Branch: {branch}
+- Mode: {execution_mode.value} - {mode_desc}
+- Workspace: {workspace_path}
+
+---
+
+"""
+
+
+@lru_cache(maxsize=256)
+def _summary(
+    session_id: str, project_name: str, branch: str, execution_mode: ExecutionMode
+) -> str:
+    """Build the one-line session summary."""
+    mode_icon = "🌳" if execution_mode == ExecutionMode.WORKTREE else "📁"
+    return (
+        f"{mode_icon} {session_id} | {project_name}:{branch} | {execution_mode.value}"
+    )
+
+
 def get_enhanced_instruction(
     instruction: str,
     session: Session,
@@ -28,22 +69,14 @@ def get_enhanced_instruction(
     Returns:
         Enhanced instruction with context prepended.
     """
-    mode_desc = (
-        "isolated worktree (safe for experiments)"
-        if session.execution_mode == ExecutionMode.WORKTREE
-        else "project folder directly (changes affect main project)"
+    context = _context_prefix(
+        session.session_id,
+        project.name,
+        project.project_id,
+        session.branch,
+        session.execution_mode,
+        session.workspace_path,
     )
-
-    context = f"""# TeleVibeCode Session Context
-- Session: {session.session_id}
-- Project: {project.name} ({project.project_id})
-- Branch: {session.branch}
-- Mode: {session.execution_mode.value} - {mode_desc}
-- Workspace: {session.workspace_path}
-
----
-
-"""
     return context + instruction
 
 
@@ -57,9 +90,6 @@ def get_context_summary(session: Session, project: Project) -> str:
     Returns:
         Short summary string.
     """
-    mode_icon = "🌳" if session.execution_mode == ExecutionMode.WORKTREE else "📁"
-    return (
-        f"{mode_icon} {session.session_id} | "
-        f"{project.name}:{session.branch} | "
-        f"{session.execution_mode.value}"
+    return _summary(
+        session.session_id, project.name, session.branch, session.execution_mode
     )
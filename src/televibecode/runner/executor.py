@@ -15,10 +15,70 @@ import structlog
 from televibecode.config import Settings
 from televibecode.db import Database, Job, JobStatus, Session, SessionState
 from televibecode.runner.context import get_enhanced_instruction
-from televibecode.tracker import SessionEvent, parse_stream_events
+from televibecode.tracker import SessionEvent, parse_stream_data
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
 
 log = structlog.get_logger()
 
+# Claude CLI stream-json lines start with the event type; user events (tool
+# results) need no decoding unless the tracker wants their contents
+_USER_EVENT_PREFIX = '{"type":"user"'
+_USER_EVENT: dict = {"type": "user"}
+
+# Claude CLI arguments around the instruction
+_CLAUDE_CMD_PREFIX = ("claude", "-p")
+_CLAUDE_CMD_SUFFIX = ("--output-format", "stream-json")
+
+# Bytes requested per stdout read in _stream_output
+_READ_CHUNK_SIZE = 64 * 1024
+
+# Job log batching: write once this many characters are pending, or after
+# this many seconds
+_LOG_FLUSH_SIZE = 16 * 1024
+_LOG_FLUSH_INTERVAL = 1.0
+
+
+def _write_log(log_file, text: str) -> None:
+    """Append text to a job log and flush it (runs in a worker thread)."""
+    log_file.write(text)
+    log_file.flush()
+
+
+# Block size for reading job logs backwards in get_job_logs
+_LOG_TAIL_BLOCK = 8 * 1024
+
+# Progress callbacks: at most one per min interval, and when nothing changed
+# only one per heartbeat (seconds)
+_PROGRESS_MIN_INTERVAL = 0.5
+_PROGRESS_HEARTBEAT = 3.0
+
+# StreamReader buffer limit and (Linux) pipe capacity for job output; the
+# reader only pauses the pipe once it holds twice the limit
+_STREAM_LIMIT = 1024 * 1024
+
+
+def _grow_stdout_pipe(proc: asyncio.subprocess.Process) -> None:
+    """Enlarge the stdout pipe so bursts of output land in fewer reads.
+
+    Best effort: only Linux supports F_SETPIPE_SZ, and the size may be capped
+    by /proc/sys/fs/pipe-max-size. The pipe is reached through the private
+    ``Process._transport``, which depends on CPython's asyncio internals
+    (uvloop, for one, may not expose the pipe); when that fails the pipe
+    keeps its default size and only ``limit=_STREAM_LIMIT`` applies.
+    """
+    set_pipe_size = getattr(fcntl, "F_SETPIPE_SZ", None) if fcntl else None
+    if set_pipe_size is None:
+        return
+    try:
+        pipe = proc._transport.get_pipe_transport(1).get_extra_info("pipe")
+        fcntl.fcntl(pipe.fileno(), set_pipe_size, _STREAM_LIMIT)
+    except (AttributeError, OSError) as e:
+        log.debug("stdout_pipe_resize_skipped", error=str(e))
+
 
 @dataclass
 class JobProgress:
@@ -33,6 +93,29 @@ class JobProgress:
     message_count: int = 0
     last_message: str | None = None
     error: str | None = None
+    # Membership index for files_touched (which keeps display order)
+    _files_seen: set[str] = field(default_factory=set, repr=False)
+
+    def add_file_touched(self, file_path: str) -> bool:
+        """Record a touched file once.
+
+        Returns:
+            True if the file was not recorded before.
+        """
+        if file_path in self._files_seen:
+            return False
+        self._files_seen.add(file_path)
+        self.files_touched.append(file_path)
+        return True
+
+    def snapshot(self) -> tuple:
+        """Fields whose change is worth a progress update."""
+        return (
+            self.tool_count,
+            self.message_count,
+            self.current_tool,
+            len(self.files_touched),
+        )
 
     def to_progress_text(self) -> str:
         """Format progress for display."""
@@ -91,6 +174,15 @@ class JobExecutor:
         self.on_event = on_event
         self._running_jobs: dict[str, asyncio.subprocess.Process] = {}
         self._job_progress: dict[str, JobProgress] = {}
+        self._cancelled: set[str] = set()
+        # Strong references so running job tasks are not garbage collected
+        self._background: set[asyncio.Task] = set()
+        # Environment for claude processes (inherit PATH to find the CLI)
+        self._child_env = {
+            "HOME": str(Path.home()),
+            "PATH": os.environ.get("PATH", "/usr/local/bin:/usr/bin:/bin"),
+            "CLAUDE_CODE_ENTRYPOINT": "televibecode",
+        }
 
     async def run_job(
         self,
@@ -140,11 +232,20 @@ class JobExecutor:
 
         return job
 
-    async def execute_job(self, job: Job) -> Job:
+    async def execute_job(
+        self,
+        job: Job,
+        on_progress: Callable[[str, JobProgress], None] | None = None,
+        on_event: Callable[[str, SessionEvent], None] | None = None,
+    ) -> Job:
         """Execute a queued job.
 
         Args:
             job: Job to execute.
+            on_progress: Progress callback for this job (defaults to the
+                executor's).
+            on_event: Session event callback for this job (defaults to the
+                executor's).
 
         Returns:
             Updated Job object.
@@ -171,7 +272,9 @@ class JobExecutor:
         # Initialize progress tracking
         progress = JobProgress(job_id=job.job_id, status="running")
         self._job_progress[job.job_id] = progress
-        start_time = datetime.now(timezone.utc)
+        # Monotonic loop clock for per-line timing (no datetime per line)
+        clock = asyncio.get_running_loop().time
+        start_time = clock()
 
         log.info(
             "job_started",
@@ -179,22 +282,6 @@ class JobExecutor:
             workspace=str(workspace_path),
         )
 
-        # Build command
-        cmd = [
-            "claude",
-            "-p",
-            job.instruction,
-            "--output-format",
-            "stream-json",
-        ]
-
-        # Set up environment (inherit PATH to find claude CLI)
-        env = {
-            "HOME": str(Path.home()),
-            "PATH": os.environ.get("PATH", "/usr/local/bin:/usr/bin:/bin"),
-            "CLAUDE_CODE_ENTRYPOINT": "televibecode",
-        }
-
         # Open log file using context manager
         log_path = Path(job.log_path) if job.log_path else None
 
@@ -209,33 +296,52 @@ class JobExecutor:
             try:
                 # Start process
                 proc = await asyncio.create_subprocess_exec(
-                    *cmd,
+                    *_CLAUDE_CMD_PREFIX,
+                    job.instruction,
+                    *_CLAUDE_CMD_SUFFIX,
                     cwd=str(workspace_path),
-                    env=env,
+                    env=self._child_env,
                     stdout=asyncio.subprocess.PIPE,
                     stderr=asyncio.subprocess.STDOUT,
+                    limit=_STREAM_LIMIT,
                 )
+                _grow_stdout_pipe(proc)
 
                 self._running_jobs[job.job_id] = proc
 
                 # Stream output
                 summary_lines = []
-                files_changed = []
-                last_progress_update = datetime.now(timezone.utc)
+                last_progress_update = start_time
+                last_snapshot = progress.snapshot()
+
+                # Hoisted out of the per-line loop (local lookups are cheaper)
+                job_id = job.job_id
+                if on_event is None:
+                    on_event = self.on_event
+                if on_progress is None:
+                    on_progress = self.on_progress
+                loads = json.loads
+                add_summary = summary_lines.append
 
                 async for line in self._stream_output(proc, log_file):
                     # Update elapsed time
-                    now = datetime.now(timezone.utc)
-                    progress.elapsed_seconds = int((now - start_time).total_seconds())
-
-                    # Parse and emit tracker events
-                    if self.on_event:
-                        for session_event in parse_stream_events(line, job.job_id):
-                            self.on_event(job.job_id, session_event)
+                    now = clock()
+                    progress.elapsed_seconds = int(now - start_time)
 
-                    # Try to parse JSON events for progress tracking
+                    # Decode once for both tracker events and progress tracking
                     try:
-                        event = json.loads(line)
+                        if on_event is None and line.startswith(_USER_EVENT_PREFIX):
+                            # Only the type of tool results is used here, and
+                            # their payloads (file contents, command output)
+                            # are the largest lines in the stream
+                            event = _USER_EVENT
+                        else:
+                            event = loads(line)
+
+                        if on_event:
+                            for session_event in parse_stream_data(event, job_id):
+                                on_event(job_id, session_event)
+
                         event_type = event.get("type")
 
                         if event_type == "assistant":
@@ -245,9 +351,10 @@ class JobExecutor:
                                 if content.get("type") == "text":
                                     text = content.get("text", "")
                                     if text:
-                                        summary_lines.append(text[:200])
+                                        short = text[:200]
+                                        add_summary(short)
                                         progress.message_count += 1
-                                        progress.last_message = text[:100]
+                                        progress.last_message = short[:100]
                                 elif content.get("type") == "tool_use":
                                     tool_name = content.get("name", "")
                                     progress.tool_count += 1
@@ -256,35 +363,40 @@ class JobExecutor:
                                     if tool_name in ("Write", "Edit", "MultiEdit"):
                                         tool_input = content.get("input", {})
                                         file_path = tool_input.get("file_path")
-                                        if file_path and file_path not in files_changed:
-                                            files_changed.append(file_path)
-                                        if (
-                                            file_path
-                                            and file_path not in progress.files_touched
-                                        ):
-                                            progress.files_touched.append(file_path)
+                                        if file_path:
+                                            progress.add_file_touched(file_path)
 
                         elif event_type == "user":
                             # Tool results
                             progress.current_tool = None
 
-                        # Report progress periodically (every 3 seconds)
-                        now = datetime.now(timezone.utc)
-                        if (now - last_progress_update).total_seconds() >= 3:
-                            if self.on_progress:
-                                self.on_progress(job.job_id, progress)
+                        # Report changes promptly (coalesced), otherwise only a
+                        # periodic heartbeat so the elapsed time stays current
+                        since_update = now - last_progress_update
+                        if since_update >= _PROGRESS_MIN_INTERVAL and (
+                            since_update >= _PROGRESS_HEARTBEAT
+                            or progress.snapshot() != last_snapshot
+                        ):
+                            if on_progress:
+                                on_progress(job_id, progress)
                             last_progress_update = now
+                            last_snapshot = progress.snapshot()
 
                     except json.JSONDecodeError:
                         # Plain text output
-                        if line.strip():
-                            summary_lines.append(line.strip()[:200])
+                        stripped = line.strip()
+                        if stripped:
+                            add_summary(stripped[:200])
 
                 # Wait for completion
                 return_code = await proc.wait()
 
                 # Update job with results
-                if return_code == 0:
+                if job.job_id in self._cancelled:
+                    job.status = JobStatus.CANCELED
+                    job.error = "Job was cancelled"
+                    progress.status = "cancelled"
+                elif return_code == 0:
                     job.status = JobStatus.DONE
                     job.result_summary = "\n".join(summary_lines[-5:])[:500]
                     progress.status = "done"
@@ -294,12 +406,12 @@ class JobExecutor:
                     progress.status = "failed"
                     progress.error = job.error
 
-                job.files_changed = files_changed if files_changed else None
+                job.files_changed = list(progress.files_touched) or None
                 job.finished_at = datetime.now(timezone.utc)
 
                 # Final progress update
-                if self.on_progress:
-                    self.on_progress(job.job_id, progress)
+                if on_progress:
+                    on_progress(job.job_id, progress)
 
             except asyncio.CancelledError:
                 job.status = JobStatus.CANCELED
@@ -318,6 +430,7 @@ class JobExecutor:
             finally:
                 self._running_jobs.pop(job.job_id, None)
                 self._job_progress.pop(job.job_id, None)
+                self._cancelled.discard(job.job_id)
 
         await self.db.update_job(job)
 
@@ -365,18 +478,80 @@ class JobExecutor:
         if not proc.stdout:
             return
 
-        while True:
-            line = await proc.stdout.readline()
-            if not line:
-                break
-
-            decoded = line.decode("utf-8", errors="replace").rstrip()
-
-            if log_file:
-                log_file.write(decoded + "\n")
-                log_file.flush()
-
-            yield decoded
+        # Read in large chunks and split lines ourselves: one wakeup covers
+        # many events, and long lines can't overrun the readline() limit
+        buffer = bytearray()
+        # Log text is batched and written from a worker thread
+        pending_log: list[str] = []
+        pending_size = 0
+        log_write: asyncio.Future | None = None
+        clock = asyncio.get_running_loop().time
+        last_log_write = clock()
+
+        async def flush_log() -> None:
+            nonlocal pending_size, last_log_write, log_write
+            # Take the batch before awaiting, so a cancelled job can't
+            # write it a second time from the finally below
+            batch = "".join(pending_log)
+            pending_log.clear()
+            pending_size = 0
+            last_log_write = clock()
+            log_write = asyncio.ensure_future(
+                asyncio.to_thread(_write_log, log_file, batch)
+            )
+            await asyncio.shield(log_write)
+
+        try:
+            while True:
+                read = proc.stdout.read(_READ_CHUNK_SIZE)
+                if pending_log:
+                    # While the job is quiet, still flush buffered log text
+                    # within the interval so get_job_logs stays current
+                    wait = _LOG_FLUSH_INTERVAL - (clock() - last_log_write)
+                    try:
+                        chunk = await asyncio.wait_for(read, max(wait, 0))
+                    except TimeoutError:
+                        await flush_log()
+                        continue
+                else:
+                    chunk = await read
+                if chunk:
+                    buffer.extend(chunk)
+                    end = buffer.rfind(b"\n")
+                    if end == -1:
+                        continue
+                    raw_lines = buffer[:end].split(b"\n")
+                    del buffer[: end + 1]
+                elif buffer:
+                    # Trailing output without a final newline
+                    raw_lines = [bytes(buffer)]
+                    buffer.clear()
+                else:
+                    break
+
+                lines = [
+                    raw.decode("utf-8", errors="replace").rstrip() for raw in raw_lines
+                ]
+
+                if log_file:
+                    text = "\n".join(lines) + "\n"
+                    pending_log.append(text)
+                    pending_size += len(text)
+                    if (
+                        pending_size >= _LOG_FLUSH_SIZE
+                        or clock() - last_log_write >= _LOG_FLUSH_INTERVAL
+                    ):
+                        await flush_log()
+
+                for decoded in lines:
+                    yield decoded
+        finally:
+            # Let an interrupted write finish first to keep the log in order,
+            # then write what is left (small) even if the job was cancelled
+            if log_write and not log_write.done():
+                await asyncio.wait([log_write])
+            if log_file and pending_log:
+                _write_log(log_file, "".join(pending_log))
 
     async def cancel_job(self, job_id: str) -> bool:
         """Cancel a running job.
@@ -389,6 +564,7 @@ class JobExecutor:
         """
         proc = self._running_jobs.get(job_id)
         if proc:
+            self._cancelled.add(job_id)
             proc.terminate()
             try:
                 await asyncio.wait_for(proc.wait(), timeout=5.0)
@@ -408,6 +584,40 @@ class JobExecutor:
         return list(self._running_jobs.keys())
 
 
+_shared_executor: JobExecutor | None = None
+
+
+def get_job_executor(settings: Settings, db: Database) -> JobExecutor:
+    """Get the executor shared by all run_instruction calls.
+
+    One instance tracks every running job, so any caller can cancel any job.
+    A new instance replaces it only if settings or database change.
+
+    Args:
+        settings: Application settings.
+        db: Database instance.
+    """
+    global _shared_executor
+    executor = _shared_executor
+    if executor is None or executor.settings is not settings or executor.db is not db:
+        executor = _shared_executor = JobExecutor(settings, db)
+    return executor
+
+
+async def cancel_running_job(job_id: str) -> bool:
+    """Stop the process of a job started through run_instruction.
+
+    Args:
+        job_id: Job to cancel.
+
+    Returns:
+        True if a running process was found and stopped.
+    """
+    if _shared_executor is None:
+        return False
+    return await _shared_executor.cancel_job(job_id)
+
+
 async def run_instruction(
     db: Database,
     settings: Settings,
@@ -440,6 +650,14 @@ async def run_instruction(
             f"Session {session_id} already has a running job: {session.current_job_id}"
         )
 
+    if session.state == SessionState.CREATING:
+        raise ValueError(f"Session {session_id} is still being set up, try again")
+    if session.state == SessionState.FAILED:
+        raise ValueError(
+            f"Session {session_id} failed to set up: {session.last_summary}. "
+            "Close it and create a new one."
+        )
+
     # Get project for context enhancement
     project = await db.get_project(session.project_id)
     if not project:
@@ -448,21 +666,71 @@ async def run_instruction(
     # Enhance instruction with session context
     enhanced_instruction = get_enhanced_instruction(instruction, session, project)
 
-    executor = JobExecutor(settings, db, on_progress, on_event)
+    executor = get_job_executor(settings, db)
     # Store original instruction in raw_input, use enhanced for execution
     job = await executor.run_job(session, enhanced_instruction, raw_input=instruction)
 
     # Execute in background with completion callback
     async def execute_with_callback():
-        completed_job = await executor.execute_job(job)
+        completed_job = await executor.execute_job(job, on_progress, on_event)
         if on_complete:
             on_complete(completed_job)
 
-    asyncio.create_task(execute_with_callback())
+    task = asyncio.create_task(execute_with_callback(), name=f"job:{job.job_id}")
+    executor._background.add(task)
+    task.add_done_callback(executor._background.discard)
 
     return job
 
 
+def _read_log_tail(log_path: Path, tail: int) -> str:
+    """Read the last ``tail`` lines of a log (all of it if tail is 0).
+
+    Reads backwards in blocks, so only the end of a large log is loaded.
+    Returns an empty string if the log does not exist.
+    """
+    try:
+        f = open(log_path, "rb")  # noqa: SIM115
+    except FileNotFoundError:
+        return ""
+    with f:
+        if not tail:
+            return f.read().decode("utf-8", errors="replace")
+
+        pos = f.seek(0, os.SEEK_END)
+        data = b""
+        while pos > 0 and not _has_tail(data, tail):
+            step = min(_LOG_TAIL_BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+
+    content = data.decode("utf-8", errors="replace")
+    if pos > 0:
+        # A suffix starts mid-file: its leading whitespace is part of a line
+        return "\n".join(content.rstrip().split("\n")[-tail:])
+    lines = content.strip().split("\n")
+    if len(lines) <= tail:
+        return content
+    return "\n".join(lines[-tail:])
+
+
+def _has_tail(data: bytes, tail: int) -> bool:
+    """Check that a log suffix holds the last ``tail`` lines of the whole log.
+
+    The suffix must contain ``tail`` complete lines after right-stripping, and
+    something non-blank before them (the whole log is stripped before
+    counting, so leading blank lines alone do not count as lines).
+    """
+    body = data.rstrip()
+    cut = len(body)
+    for _ in range(tail):
+        cut = body.rfind(b"\n", 0, cut)
+        if cut < 0:
+            return False
+    return bool(body[:cut].strip())
+
+
 async def get_job_logs(
     db: Database,
     job_id: str,
@@ -484,11 +752,7 @@ async def get_job_logs(
 
     logs = ""
     if job.log_path:
-        log_path = Path(job.log_path)
-        if log_path.exists():
-            content = log_path.read_text(encoding="utf-8", errors="replace")
-            lines = content.strip().split("\n")
-            logs = "\n".join(lines[-tail:]) if tail and len(lines) > tail else content
+        logs = await asyncio.to_thread(_read_log_tail, Path(job.log_path), tail)
 
     return {
         "job_id": job_id,
@@ -503,6 +767,7 @@ async def list_session_jobs(
     db: Database,
     session_id: str,
     limit: int = 10,
+    status: JobStatus | None = None,
 ) -> list[dict]:
     """List jobs for a session.
 
@@ -510,11 +775,12 @@ async def list_session_jobs(
         db: Database instance.
         session_id: Session ID.
         limit: Maximum jobs to return.
+        status: Optional status filter.
 
     Returns:
         List of job dictionaries.
     """
-    jobs = await db.get_jobs_by_session(session_id, limit=limit)
+    jobs = await db.get_jobs_by_session(session_id, limit=limit, status=status)
 
     return [
         {
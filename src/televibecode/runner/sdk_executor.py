@@ -11,6 +11,9 @@ See docs/sdk-analysis.md for comparison with subprocess approach.
 """
 
 import asyncio
+import contextlib
+import json
+import re
 import uuid
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
@@ -110,6 +113,27 @@ SHELL_DANGEROUS_PATTERNS = [
     ":(){:|:&};:",  # Fork bomb
 ]
 
+# Lookup structures derived from the lists above (one C-level pass each)
+_SAFE_EXACT = frozenset(SHELL_WHITELIST)
+_SAFE_PREFIXES = tuple(safe + " " for safe in SHELL_WHITELIST)
+_DANGEROUS_RE = re.compile("|".join(map(re.escape, SHELL_DANGEROUS_PATTERNS)))
+
+# File paths whose edits always need approval
+SENSITIVE_PATH_PATTERNS = [
+    ".env",
+    "credentials",
+    "secret",
+    "password",
+    "private_key",
+    ".ssh/",
+    "/etc/",
+]
+_SENSITIVE_PATH_RE = re.compile("|".join(map(re.escape, SENSITIVE_PATH_PATTERNS)))
+
+# Tools get_approval_type_for_tool can gate; every other tool is auto-approved
+_GATED_TOOLS = frozenset({"Bash", "Write", "Edit", "MultiEdit", "WebFetch"})
+_GATED_TOOLS_MATCHER = "|".join(sorted(_GATED_TOOLS))
+
 
 def is_safe_command(command: str) -> bool:
     """Check if a shell command is in the safe whitelist.
@@ -122,12 +146,8 @@ def is_safe_command(command: str) -> bool:
     """
     command_lower = command.lower().strip()
 
-    # Check exact matches
-    for safe in SHELL_WHITELIST:
-        if command_lower == safe or command_lower.startswith(safe + " "):
-            return True
-
-    return False
+    # Exact match, or a whitelisted command followed by arguments
+    return command_lower in _SAFE_EXACT or command_lower.startswith(_SAFE_PREFIXES)
 
 
 def is_dangerous_command(command: str) -> bool:
@@ -139,8 +159,7 @@ def is_dangerous_command(command: str) -> bool:
     Returns:
         True if command is dangerous.
     """
-    command_lower = command.lower()
-    return any(pattern in command_lower for pattern in SHELL_DANGEROUS_PATTERNS)
+    return _DANGEROUS_RE.search(command.lower()) is not None
 
 
 def get_approval_type_for_tool(
@@ -179,18 +198,8 @@ def get_approval_type_for_tool(
         file_path = tool_input.get("file_path", "")
 
         # Sensitive files always need approval
-        sensitive_patterns = [
-            ".env",
-            "credentials",
-            "secret",
-            "password",
-            "private_key",
-            ".ssh/",
-            "/etc/",
-        ]
-        for pattern in sensitive_patterns:
-            if pattern in file_path.lower():
-                return ApprovalType.DANGEROUS_EDIT
+        if _SENSITIVE_PATH_RE.search(file_path.lower()):
+            return ApprovalType.DANGEROUS_EDIT
 
         # Normal file writes: auto-approve (per specs)
         return None
@@ -223,6 +232,20 @@ class SDKJobProgress:
     waiting_approval: bool = False
     approval_tool: str | None = None
     approval_details: str | None = None
+    # Membership index for files_touched (which keeps display order)
+    _files_seen: set[str] = field(default_factory=set, repr=False)
+
+    def add_file_touched(self, file_path: str) -> bool:
+        """Record a touched file once.
+
+        Returns:
+            True if the file was not recorded before.
+        """
+        if file_path in self._files_seen:
+            return False
+        self._files_seen.add(file_path)
+        self.files_touched.append(file_path)
+        return True
 
     def to_progress_text(self) -> str:
         """Format progress for display."""
@@ -296,10 +319,117 @@ class ApprovalResponse:
 ApprovalCallback = Callable[[ApprovalRequest], Awaitable[ApprovalResponse]]
 
 
+def _deny_tool_use(reason: str) -> dict[str, Any]:
+    """Build a PreToolUse hook result that blocks the tool."""
+    return {
+        "hookSpecificOutput": {
+            "hookEventName": "PreToolUse",
+            "permissionDecision": "deny",
+            "permissionDecisionReason": reason,
+        }
+    }
+
+
+def _describe_shell(tool_input: dict[str, Any]) -> str:
+    command = tool_input.get("command", "")
+    if "git push" in command.lower():
+        return f"Git push: `{command}`"
+    return f"Shell command: `{command}`"
+
+
+def _describe_file_edit(tool_input: dict[str, Any]) -> str:
+    return f"Edit sensitive file: `{tool_input.get('file_path', '')}`"
+
+
+def _describe_fetch(tool_input: dict[str, Any]) -> str:
+    return f"Fetch external URL: `{tool_input.get('url', '')}`"
+
+
+# Approval descriptions by tool name
+_APPROVAL_FORMATTERS: dict[str, Callable[[dict[str, Any]], str]] = {
+    "Bash": _describe_shell,
+    "Write": _describe_file_edit,
+    "Edit": _describe_file_edit,
+    "MultiEdit": _describe_file_edit,
+    "WebFetch": _describe_fetch,
+}
+
+
 # =============================================================================
 # SDK Job Executor
 # =============================================================================
 
+# Seconds between progress callbacks while a job runs
+_PROGRESS_INTERVAL = 3.0
+
+# Most queued log lines written (and flushed) together
+_LOG_BATCH_LINES = 64
+
+# Characters of each tool output kept in the job log
+_LOG_OUTPUT_PREVIEW = 500
+
+_preview_encoder = json.JSONEncoder(default=str)
+
+
+def _json_preview(value: Any, limit: int) -> str:
+    """JSON-encode a value, stopping once ``limit`` characters are produced.
+
+    Large tool outputs are only encoded as far as the log keeps them.
+    """
+    parts: list[str] = []
+    size = 0
+    for chunk in _preview_encoder.iterencode(value):
+        parts.append(chunk)
+        size += len(chunk)
+        if size >= limit:
+            break
+    return "".join(parts)[:limit]
+
+
+def _append_log(log_file, text: str) -> None:
+    """Append text to a job log and flush it (runs in a worker thread)."""
+    log_file.write(text)
+    log_file.flush()
+
+
+async def _write_log_queue(
+    log_path: Path, log_queue: asyncio.Queue[str | None]
+) -> None:
+    """Write queued log lines to a file until None is received.
+
+    File I/O runs in a worker thread so the SDK message loop never blocks
+    on disk. Lines already waiting in the queue are written in one batch.
+
+    A log that cannot be opened or written is reported and abandoned; the
+    job itself carries on.
+
+    Args:
+        log_path: Log file to create.
+        log_queue: Lines to write; None ends the writer.
+    """
+    try:
+        await asyncio.to_thread(log_path.parent.mkdir, parents=True, exist_ok=True)
+        log_file = await asyncio.to_thread(open, log_path, "w", encoding="utf-8")
+    except Exception as e:
+        log.error("job_log_failed", log_path=str(log_path), error=str(e))
+        return
+    try:
+        done = False
+        while not done:
+            batch = [await log_queue.get()]
+            while len(batch) < _LOG_BATCH_LINES and not log_queue.empty():
+                batch.append(log_queue.get_nowait())
+            if None in batch:
+                done = True
+                batch = batch[: batch.index(None)]
+            if batch:
+                await asyncio.to_thread(_append_log, log_file, "".join(batch))
+    except Exception as e:
+        log.error("job_log_failed", log_path=str(log_path), error=str(e))
+    finally:
+        with contextlib.suppress(Exception):
+            await asyncio.to_thread(log_file.close)
+
 
 class SDKJobExecutor:
     """Execute jobs using Claude Agent SDK.
@@ -415,6 +545,8 @@ class SDKJobExecutor:
         ) -> dict[str, Any]:
             """Hook that checks tool usage and requests approval if needed."""
             tool_name = input_data.get("tool_name", "")
+            if tool_name not in _GATED_TOOLS:
+                return {}
             tool_input = input_data.get("tool_input", {})
 
             # Check if approval is required
@@ -448,7 +580,6 @@ class SDKJobExecutor:
             job.approval_required = True
             job.approval_scope = approval_type.value
             job.approval_state = ApprovalState.PENDING
-            await self.db.update_job(job)
 
             # Create approval request
             approval_id = str(uuid.uuid4())[:8]
@@ -467,7 +598,7 @@ class SDKJobExecutor:
                 description=description,
             )
 
-            # Store approval in database
+            # Store approval and job status in one transaction
             approval = Approval(
                 approval_id=approval_id,
                 job_id=job.job_id,
@@ -478,7 +609,7 @@ class SDKJobExecutor:
                 action_details={"tool_name": tool_name, "tool_input": tool_input},
                 state=ApprovalState.PENDING,
             )
-            await self.db.create_approval(approval)
+            await self.db.open_approval(job, approval)
 
             # Request approval via callback
             if self.on_approval_needed:
@@ -500,16 +631,15 @@ class SDKJobExecutor:
                         else ApprovalState.DENIED
                     )
                     approval.approved_at = datetime.now(timezone.utc)
-                    await self.db.update_approval(approval)
 
-                    # Update job
+                    # Update job, then save both together
                     job.approval_state = approval.state
                     if response.approved:
                         job.status = JobStatus.RUNNING
                     else:
                         job.status = JobStatus.CANCELED
                         job.error = f"Approval denied: {response.reason or 'No reason'}"
-                    await self.db.update_job(job)
+                    await self.db.resolve_approval(job, approval)
 
                     # Update progress
                     if progress:
@@ -520,14 +650,7 @@ class SDKJobExecutor:
                             self.on_progress(job.job_id, progress)
 
                     if not response.approved:
-                        return {
-                            "hookSpecificOutput": {
-                                "hookEventName": "PreToolUse",
-                                "permissionDecision": "deny",
-                                "permissionDecisionReason": response.reason
-                                or "User denied approval",
-                            }
-                        }
+                        return _deny_tool_use(response.reason or "User denied approval")
 
                 finally:
                     self._pending_approvals.pop(approval_id, None)
@@ -553,32 +676,21 @@ class SDKJobExecutor:
         Returns:
             Formatted description.
         """
-        if tool_name == "Bash":
-            command = tool_input.get("command", "")
-            if "git push" in command.lower():
-                return f"Git push: `{command}`"
-            return f"Shell command: `{command}`"
-
-        if tool_name in ("Write", "Edit", "MultiEdit"):
-            file_path = tool_input.get("file_path", "")
-            return f"Edit sensitive file: `{file_path}`"
-
-        if tool_name == "WebFetch":
-            url = tool_input.get("url", "")
-            return f"Fetch external URL: `{url}`"
-
+        formatter = _APPROVAL_FORMATTERS.get(tool_name)
+        if formatter:
+            return formatter(tool_input)
         return f"{approval_type.value}: {tool_name}"
 
     def _create_logging_hook(
         self,
         job: Job,
-        log_file,
+        write_log: Callable[[str], None] | None,
     ) -> Callable[[dict, str | None, HookContext], Awaitable[dict]]:
         """Create a PostToolUse hook for logging.
 
         Args:
             job: Current job.
-            log_file: Log file handle.
+            write_log: Appends a line to the job's log, if it has one.
 
         Returns:
             Hook callback function.
@@ -599,16 +711,14 @@ class SDKJobExecutor:
                 progress.current_tool = None
 
             # Log to file
-            if log_file:
+            if write_log:
                 timestamp = datetime.now(timezone.utc).isoformat()
                 log_line = f"[{timestamp}] PostToolUse: {tool_name}\n"
-                log_file.write(log_line)
+                write_log(log_line)
 
                 if tool_output:
-                    import json
-
-                    log_file.write(f"  Output: {json.dumps(tool_output)[:500]}\n")
-                log_file.flush()
+                    preview = _json_preview(tool_output, _LOG_OUTPUT_PREVIEW)
+                    write_log(f"  Output: {preview}\n")
 
             return {}
 
@@ -645,7 +755,9 @@ class SDKJobExecutor:
         # Initialize progress tracking
         progress = SDKJobProgress(job_id=job.job_id, status="running")
         self._job_progress[job.job_id] = progress
-        start_time = datetime.now(timezone.utc)
+        loop = asyncio.get_running_loop()
+        clock = loop.time
+        start_time = clock()
 
         log.info(
             "job_started",
@@ -656,12 +768,17 @@ class SDKJobExecutor:
 
         # Open log file
         log_path = Path(job.log_path) if job.log_path else None
-        log_file = None
+        log_queue: asyncio.Queue[str | None] = asyncio.Queue()
+        log_writer: asyncio.Task | None = None
+
+        def write_log(text: str) -> None:
+            # Stop queueing once the writer is gone (e.g. after a disk error)
+            if log_writer is not None and not log_writer.done():
+                log_queue.put_nowait(text)
 
         try:
             if log_path:
-                log_path.parent.mkdir(parents=True, exist_ok=True)
-                log_file = open(log_path, "w", encoding="utf-8")  # noqa: SIM115
+                log_writer = asyncio.create_task(_write_log_queue(log_path, log_queue))
 
             # Build SDK options
             options = ClaudeAgentOptions(
@@ -686,14 +803,18 @@ class SDKJobExecutor:
                 hooks={
                     "PreToolUse": [
                         HookMatcher(
-                            matcher="Bash|Write|Edit|MultiEdit|WebFetch",
+                            matcher=_GATED_TOOLS_MATCHER,
                             hooks=[self._create_approval_hook(job, session)],
                             timeout=3600,  # 1 hour for approval (per specs)
                         ),
                     ],
                     "PostToolUse": [
                         HookMatcher(
-                            hooks=[self._create_logging_hook(job, log_file)],
+                            hooks=[
+                                self._create_logging_hook(
+                                    job, write_log if log_path else None
+                                )
+                            ],
                         ),
                     ],
                 },
@@ -712,8 +833,18 @@ class SDKJobExecutor:
             self._running_clients[job.job_id] = client
 
             summary_lines: list[str] = []
-            files_changed: list[str] = []
-            last_progress_update = datetime.now(timezone.utc)
+
+            # Report progress on a timer rather than checking on every message
+            progress_handle: asyncio.TimerHandle | None = None
+
+            def flush_progress() -> None:
+                nonlocal progress_handle
+                progress.elapsed_seconds = int(clock() - start_time)
+                self.on_progress(job.job_id, progress)
+                progress_handle = loop.call_later(_PROGRESS_INTERVAL, flush_progress)
+
+            if self.on_progress:
+                progress_handle = loop.call_later(_PROGRESS_INTERVAL, flush_progress)
 
             try:
                 async with client:
@@ -722,10 +853,7 @@ class SDKJobExecutor:
                     # Process responses
                     async for message in client.receive_response():
                         # Update elapsed time
-                        now = datetime.now(timezone.utc)
-                        progress.elapsed_seconds = int(
-                            (now - start_time).total_seconds()
-                        )
+                        progress.elapsed_seconds = int(clock() - start_time)
 
                         # Handle different message types
                         if isinstance(message, AssistantMessage):
@@ -745,9 +873,7 @@ class SDKJobExecutor:
                                         )
                                         self.on_event(job.job_id, event)
 
-                                    if log_file:
-                                        log_file.write(f"[Assistant] {text}\n")
-                                        log_file.flush()
+                                    write_log(f"[Assistant] {text}\n")
 
                                 elif isinstance(block, ToolUseBlock):
                                     progress.tool_count += 1
@@ -771,17 +897,12 @@ class SDKJobExecutor:
                                     ):
                                         file_path = block.input.get("file_path")
                                         if file_path:
-                                            if file_path not in files_changed:
-                                                files_changed.append(file_path)
-                                            if file_path not in progress.files_touched:
-                                                progress.files_touched.append(file_path)
-
-                                    if log_file:
-                                        log_file.write(
-                                            f"[ToolUse] {block.name}: "
-                                            f"{str(block.input)[:200]}\n"
-                                        )
-                                        log_file.flush()
+                                            progress.add_file_touched(file_path)
+
+                                    write_log(
+                                        f"[ToolUse] {block.name}: "
+                                        f"{str(block.input)[:200]}\n"
+                                    )
 
                                 elif isinstance(block, ToolResultBlock):
                                     progress.current_tool = None
@@ -792,7 +913,7 @@ class SDKJobExecutor:
                                             content = str(block.content)
                                         else:
                                             content = ""
-                                        is_err = getattr(block, 'is_error', False)
+                                        is_err = getattr(block, "is_error", False)
                                         event = ToolResultEvent(
                                             session_id=job.session_id,
                                             job_id=job.job_id,
@@ -802,17 +923,12 @@ class SDKJobExecutor:
                                         )
                                         self.on_event(job.job_id, event)
 
-                                    if log_file:
+                                    if log_path:
                                         content = str(block.content)[:200]
-                                        log_file.write(f"[ToolResult] {content}\n")
-                                        log_file.flush()
+                                        write_log(f"[ToolResult] {content}\n")
 
                         elif isinstance(message, SystemMessage):
-                            if log_file:
-                                log_file.write(
-                                    f"[System] {message.subtype}: {message.data}\n"
-                                )
-                                log_file.flush()
+                            write_log(f"[System] {message.subtype}: {message.data}\n")
 
                         elif isinstance(message, ResultMessage):
                             # Emit result tracker event
@@ -841,20 +957,11 @@ class SDKJobExecutor:
                                 "done" if not message.is_error else "failed"
                             )
 
-                            if log_file:
-                                log_file.write(
-                                    f"[Result] success={not message.is_error}, "
-                                    f"turns={message.num_turns}, "
-                                    f"cost=${message.total_cost_usd or 0:.4f}\n"
-                                )
-                                log_file.flush()
-
-                        # Report progress periodically (every 3 seconds)
-                        now = datetime.now(timezone.utc)
-                        if (now - last_progress_update).total_seconds() >= 3:
-                            if self.on_progress:
-                                self.on_progress(job.job_id, progress)
-                            last_progress_update = now
+                            write_log(
+                                f"[Result] success={not message.is_error}, "
+                                f"turns={message.num_turns}, "
+                                f"cost=${message.total_cost_usd or 0:.4f}\n"
+                            )
 
             except asyncio.CancelledError:
                 job.status = JobStatus.CANCELED
@@ -870,20 +977,31 @@ class SDKJobExecutor:
 
             finally:
                 self._running_clients.pop(job.job_id, None)
+                if progress_handle:
+                    progress_handle.cancel()
 
             # Update job with results
             job.result_summary = "\n".join(summary_lines[-5:])[:500]
-            job.files_changed = files_changed if files_changed else None
+            job.files_changed = list(progress.files_touched) or None
             job.finished_at = datetime.now(timezone.utc)
 
             # Final progress update
             if self.on_progress:
                 self.on_progress(job.job_id, progress)
 
+        except Exception as e:
+            # Errors outside the SDK loop must still end the job
+            job.status = JobStatus.FAILED
+            job.error = str(e)
+            job.finished_at = datetime.now(timezone.utc)
+            log.error("job_error", job_id=job.job_id, error=str(e), executor="sdk")
+
         finally:
             self._job_progress.pop(job.job_id, None)
-            if log_file:
-                log_file.close()
+            if log_writer:
+                log_queue.put_nowait(None)
+                # wait() never re-raises; the writer reports its own errors
+                await asyncio.wait([log_writer])
 
         await self.db.update_job(job)
 
@@ -953,6 +1071,9 @@ class SDKJobExecutor:
 # Helper Functions (matching executor.py interface)
 # =============================================================================
 
+# Strong references to running jobs (the loop only keeps weak ones)
+_background_tasks: set[asyncio.Task] = set()
+
 
 async def run_instruction_sdk(
     db: Database,
@@ -988,6 +1109,14 @@ async def run_instruction_sdk(
             f"Session {session_id} already has a running job: {session.current_job_id}"
         )
 
+    if session.state == SessionState.CREATING:
+        raise ValueError(f"Session {session_id} is still being set up, try again")
+    if session.state == SessionState.FAILED:
+        raise ValueError(
+            f"Session {session_id} failed to set up: {session.last_summary}. "
+            "Close it and create a new one."
+        )
+
     # Get project for context enhancement
     project = await db.get_project(session.project_id)
     if not project:
@@ -1003,7 +1132,9 @@ async def run_instruction_sdk(
     job = await executor.run_job(session, enhanced_instruction, raw_input=instruction)
 
     # Execute in background
-    asyncio.create_task(executor.execute_job(job))
+    task = asyncio.create_task(executor.execute_job(job), name=f"job:{job.job_id}")
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
 
     return job
 
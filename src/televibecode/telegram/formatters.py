@@ -250,10 +250,12 @@ def format_job_status(
 def _session_state_icon(state: SessionState) -> str:
     """Get icon for session state."""
     icons = {
+        SessionState.CREATING: "⏳",
         SessionState.IDLE: "🟢",
         SessionState.RUNNING: "🔧",
         SessionState.BLOCKED: "⏸️",
         SessionState.CLOSING: "🔴",
+        SessionState.FAILED: "❌",
     }
     return icons.get(state, "❓")
 
@@ -120,14 +120,23 @@ __all__ = [
 def _session_state_icon(state: SessionState) -> str:
     """Get icon for session state."""
     icons = {
+        SessionState.CREATING: "⏳",
         SessionState.IDLE: "🟢",
         SessionState.RUNNING: "🔧",
         SessionState.BLOCKED: "⏸️",
         SessionState.CLOSING: "🔴",
+        SessionState.FAILED: "❌",
     }
     return icons.get(state, "❓")
 
 
+def _session_ready_note(result: dict) -> str:
+    """Tell the user whether a newly created session accepts instructions yet."""
+    if result.get("state") == SessionState.CREATING.value:
+        return "⏳ Setting up the worktree… it will accept instructions shortly."
+    return "Ready for instructions!"
+
+
 async def add_reaction(
     context: ContextTypes.DEFAULT_TYPE,
     chat_id: int,
@@ -644,7 +653,7 @@ async def newproject_callback_handler(
             [
                 f"\n🔹 Session `{sid}` created",
                 f"🌿 Branch: `{branch}`",
-                "\nReady for instructions!",
+                f"\n{_session_ready_note(session_result)}",
             ]
         )
 
@@ -786,7 +795,8 @@ async def new_session_command(
             f"🌿 Branch: `{escape_markdown(result['branch'])}`\n"
             f"{mode_icon} Mode: {mode_name}\n"
             f"📍 {escape_markdown(result['workspace_path'])}\n\n"
-            f"_This is now your active session._"
+            f"_This is now your active session._\n"
+            f"{_session_ready_note(result)}"
         )
         await send_with_context(
             update,
@@ -999,7 +1009,7 @@ async def close_callback_handler(
     if action == "push":
         # Push first, then show options again
         try:
-            result = await sessions.push_session_branch(db, session_id)
+            result = await sessions.push_session_branch(db, session_id, wait=True)
             if result.get("pushed"):
                 await query.edit_message_text(
                     "✅ Branch pushed to origin.\n\nNow close the session?",
@@ -1054,6 +1064,7 @@ async def close_callback_handler(
             session_id=session_id,
             force=True,
             delete_branch=delete_branch,
+            settings=get_settings(context),
         )
 
         # Clear active session if it was this one
@@ -1128,7 +1139,7 @@ async def push_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     )
 
     try:
-        result = await sessions.push_session_branch(db, session_id)
+        result = await sessions.push_session_branch(db, session_id, wait=True)
 
         if result.get("pushed"):
             await status_msg.edit_text(
@@ -1214,7 +1225,10 @@ async def _do_cleanup_all_sessions(update, context, all_sessions) -> None:
     for session in all_sessions:
         try:
             await sessions.close_session(
-                db=db, session_id=session.session_id, force=True
+                db=db,
+                session_id=session.session_id,
+                force=True,
+                settings=get_settings(context),
             )
             closed += 1
             log.info("cleanup_session_closed", session_id=session.session_id)
@@ -4550,7 +4564,8 @@ async def _execute_command(
             f"✅ Session created: {escape_markdown(result['session_id'])}\n\n"
             f"📂 {escape_markdown(result['project_id'])} "
             f"🌿 {escape_markdown(result['branch'])}\n"
-            f"📁 {escape_markdown(result['workspace_path'])}"
+            f"📁 {escape_markdown(result['workspace_path'])}\n\n"
+            f"{_session_ready_note(result)}"
         )
         return True
 
@@ -4563,7 +4578,7 @@ async def _execute_command(
             await send("No active session to close.")
             return True
         try:
-            await sessions.close_session(db, session_id)
+            await sessions.close_session(db, get_settings(context), session_id)
         except ValueError as e:
             await send(f"Error: {e}")
             return True
@@ -4646,7 +4661,7 @@ async def _execute_command(
                 f"📂 `{escape_markdown(result['path'])}`\n"
                 f"🔹 Session `{sid}` created\n"
                 f"🌿 Branch: `{branch}`\n\n"
-                f"Ready for instructions!"
+                f"{_session_ready_note(session_result)}"
             )
         except ValueError as e:
             await send(f"❌ Error: {e}")
@@ -26,6 +26,7 @@ from televibecode.tracker.events import (
 from televibecode.tracker.manager import (
     JobTrackerManager,
     RateLimiter,
+    parse_stream_data,
     parse_stream_event,
     parse_stream_events,
 )
@@ -59,6 +60,7 @@ __all__ = [
     # Manager
     "JobTrackerManager",
     "RateLimiter",
+    "parse_stream_data",
     "parse_stream_event",
     "parse_stream_events",
 ]
@@ -595,6 +595,21 @@ def parse_stream_events(line: str, job_id: str | None = None) -> list[SessionEve
     except json.JSONDecodeError:
         return []
 
+    return parse_stream_data(data, job_id)
+
+
+def parse_stream_data(data: dict, job_id: str | None = None) -> list[SessionEvent]:
+    """Build SessionEvents from an already decoded stream-json event.
+
+    Lets callers that decode each line themselves avoid parsing it twice.
+
+    Args:
+        data: Decoded JSON object from one stream-json line.
+        job_id: Job ID to attach to events.
+
+    Returns:
+        List of SessionEvents.
+    """
     event_type = data.get("type")
     session_id = data.get("session_id")
     events: list[SessionEvent] = []
@@ -1,5 +1,9 @@
 """Tests for the database layer."""
 
+import asyncio
+import sqlite3
+from datetime import datetime, timezone
+
 import pytest
 
 from televibecode.db import (
@@ -7,6 +11,7 @@ from televibecode.db import (
     ApprovalState,
     ApprovalType,
     Database,
+    ExecutionMode,
     Job,
     JobStatus,
     Project,
@@ -87,6 +92,35 @@ class TestProjectCRUD:
         assert len(projects) == 1
         assert projects[0].project_id == sample_project.project_id
 
+    async def test_iter_projects(self, db: Database, sample_project: Project):
+        """Test streaming all projects."""
+        projects = [p async for p in db.iter_projects()]
+        assert [p.project_id for p in projects] == [sample_project.project_id]
+
+    async def test_create_projects(self, db: Database, sample_project: Project):
+        """Test batch insert skips conflicting projects."""
+        projects = [
+            Project(project_id="alpha", name="Alpha", path="/tmp/alpha"),
+            Project(project_id="alpha", name="Alpha 2", path="/tmp/alpha-2"),
+            Project(project_id="beta", name="Beta", path=sample_project.path),
+        ]
+        inserted = await db.create_projects(projects)
+        assert [p.path for p in inserted] == ["/tmp/alpha"]
+        assert len(await db.get_all_projects()) == 2
+
+    async def test_get_projects_by_ids(self, db: Database, sample_project: Project):
+        """Test batch lookup of projects by ID."""
+        found = await db.get_projects_by_ids([sample_project.project_id, "missing"])
+        assert list(found) == [sample_project.project_id]
+        assert await db.get_projects_by_ids([]) == {}
+
+    async def test_get_projects_by_paths(self, db: Database, sample_project: Project):
+        """Test batch lookup of projects by path."""
+        found = await db.get_projects_by_paths([sample_project.path, "/nowhere"])
+        assert list(found) == [sample_project.path]
+        assert found[sample_project.path].project_id == sample_project.project_id
+        assert await db.get_projects_by_paths([]) == {}
+
     async def test_update_project(self, db: Database, sample_project: Project):
         """Test updating a project."""
         sample_project.name = "Updated Name"
@@ -137,6 +171,97 @@ class TestSessionCRUD:
         session = await db.get_session(sample_session.session_id)
         assert session.state == SessionState.RUNNING
 
+    async def test_get_session_with_project(
+        self, db: Database, sample_session: Session, sample_project: Project
+    ):
+        """Test fetching a session together with its project."""
+        pair = await db.get_session_with_project(sample_session.session_id)
+        assert pair is not None
+        session, project = pair
+        assert session.session_id == sample_session.session_id
+        assert session.created_at == sample_session.created_at
+        assert project is not None
+        assert project.project_id == sample_project.project_id
+        assert project.path == sample_project.path
+
+        assert await db.get_session_with_project("missing") is None
+
+    async def test_session_iso_timestamps(self, db: Database, sample_session: Session):
+        """Test cached ISO strings track the datetime fields."""
+        session = await db.get_session(sample_session.session_id)
+        assert session.created_at_iso == session.created_at.isoformat()
+
+        await db.update_session(session)
+        assert session.last_activity_at_iso == session.last_activity_at.isoformat()
+
+    async def test_get_sessions_by_project_excludes_closing(
+        self, db: Database, sample_session: Session
+    ):
+        """Test filtering closing sessions out in SQL."""
+        project_id = sample_session.project_id
+        await db.update_session_state(sample_session.session_id, SessionState.CLOSING)
+        assert len(await db.get_sessions_by_project(project_id)) == 1
+        assert await db.get_sessions_by_project(project_id, include_closed=False) == []
+
+    async def test_stream_sessions(self, db: Database, sample_session: Session):
+        """Test streaming sessions with their project names."""
+        rows = [row async for row in db.stream_sessions(sample_session.project_id)]
+        assert [(s.session_id, name) for s, name in rows] == [
+            (sample_session.session_id, "Test Project")
+        ]
+
+        await db.update_session_state(sample_session.session_id, SessionState.CLOSING)
+        assert [row async for row in db.stream_sessions()] == []
+        assert len([row async for row in db.stream_sessions(include_closed=True)]) == 1
+
+    async def test_get_session_cached(self, db: Database, sample_session: Session):
+        """Test cached session reads are invalidated by writes."""
+        sid = sample_session.session_id
+        cached = await db.get_session_cached(sid)
+        cached.state = SessionState.BLOCKED  # mutating the copy is harmless
+        assert (await db.get_session_cached(sid)).state == SessionState.IDLE
+
+        await db.update_session_state(sid, SessionState.RUNNING)
+        assert (await db.get_session_cached(sid)).state == SessionState.RUNNING
+
+        await db.delete_session(sid)
+        assert await db.get_session_cached(sid) is None
+
+    async def test_get_session_by_branch(self, db: Database, sample_session: Session):
+        """Test looking up the active session on a branch."""
+        found = await db.get_session_by_branch(
+            sample_session.project_id, sample_session.branch
+        )
+        assert found is not None
+        assert found.session_id == sample_session.session_id
+
+        await db.update_session_state(sample_session.session_id, SessionState.CLOSING)
+        assert (
+            await db.get_session_by_branch(
+                sample_session.project_id, sample_session.branch
+            )
+            is None
+        )
+
+    async def test_get_active_direct_session(
+        self, db: Database, sample_session: Session
+    ):
+        """Test looking up the active direct-mode session of a project."""
+        project_id = sample_session.project_id
+        assert await db.get_active_direct_session(project_id) is None
+
+        direct = Session(
+            session_id="S2",
+            project_id=project_id,
+            workspace_path="/tmp/project",
+            branch="main",
+            execution_mode=ExecutionMode.DIRECT,
+        )
+        await db.create_session(direct)
+        found = await db.get_active_direct_session(project_id)
+        assert found is not None
+        assert found.session_id == "S2"
+
     async def test_get_next_session_number(self, db: Database, sample_project: Project):
         """Test getting next session number."""
         # First session
@@ -156,6 +281,66 @@ class TestSessionCRUD:
         num2 = await db.get_next_session_number()
         assert num2 == 2
 
+    async def test_attach_and_detach_task(
+        self, db: Database, sample_session: Session, sample_project: Project
+    ):
+        """Test attaching and detaching a task in one transaction each."""
+        task = Task(task_id="T-001", project_id=sample_project.project_id, title="A")
+        await db.create_task(task)
+        sid = sample_session.session_id
+
+        assert await db.attach_task_to_session(sid, "T-001", sample_session.branch)
+        assert not await db.attach_task_to_session(sid, "T-001", sample_session.branch)
+        session = await db.get_session(sid)
+        assert session.attached_task_ids == ["T-001"]
+        task = await db.get_task("T-001")
+        assert task.session_id == sid
+        assert task.branch == sample_session.branch
+
+        assert await db.detach_task_from_session(sid, "T-001")
+        assert not await db.detach_task_from_session(sid, "T-001")
+        session = await db.get_session(sid)
+        assert session.attached_task_ids == []
+        task = await db.get_task("T-001")
+        assert task.session_id is None
+
+    async def test_attach_task_without_pointing_task(
+        self, db: Database, sample_session: Session, sample_project: Project
+    ):
+        """Test attaching leaves the task row alone when asked to."""
+        task = Task(task_id="T-001", project_id=sample_project.project_id, title="A")
+        await db.create_task(task)
+        sid = sample_session.session_id
+
+        assert await db.attach_task_to_session(
+            sid, "T-001", sample_session.branch, point_task=False
+        )
+        session = await db.get_session(sid)
+        assert session.attached_task_ids == ["T-001"]
+        task = await db.get_task("T-001")
+        assert task.session_id is None
+
+    async def test_fail_interrupted_setups(
+        self, db: Database, sample_project: Project, sample_session: Session
+    ):
+        """Test failing sessions whose worktree setup never finished."""
+        creating = Session(
+            session_id="S3",
+            project_id=sample_project.project_id,
+            workspace_path="/tmp/workspaces/S3",
+            branch="televibe/S3",
+            state=SessionState.CREATING,
+        )
+        await db.create_session(creating)
+
+        assert await db.fail_interrupted_setups() == 1
+
+        session = await db.get_session("S3")
+        assert session.state == SessionState.FAILED
+        assert session.last_summary
+        idle = await db.get_session(sample_session.session_id)
+        assert idle.state == SessionState.IDLE
+
 
 class TestTaskCRUD:
     """Test task CRUD operations."""
@@ -200,6 +385,70 @@ class TestTaskCRUD:
         tasks = await db.get_tasks_by_project(sample_project.project_id)
         assert len(tasks) == 3
 
+        await db.update_task(
+            (await db.get_task("T-001")).model_copy(update={"status": TaskStatus.DONE})
+        )
+        done = await db.get_tasks_by_project(
+            sample_project.project_id, status=TaskStatus.DONE
+        )
+        assert [t.task_id for t in done] == ["T-001"]
+        capped = await db.get_tasks_by_project(sample_project.project_id, limit=2)
+        assert len(capped) == 2
+
+    async def test_bulk_create_and_update_tasks(
+        self, db: Database, sample_project: Project
+    ):
+        """Test creating and updating tasks in bulk."""
+        tasks = [
+            Task(
+                task_id=f"T-{i:03d}",
+                project_id=sample_project.project_id,
+                title=f"Task {i}",
+            )
+            for i in range(3)
+        ]
+        await db.bulk_create_tasks(tasks)
+        await db.bulk_update_tasks([])
+
+        tasks[1].status = TaskStatus.DONE
+        await db.bulk_update_tasks([tasks[1]])
+
+        retrieved = await db.get_task("T-001")
+        assert retrieved.status == TaskStatus.DONE
+        assert len(await db.get_tasks_by_project(sample_project.project_id)) == 3
+
+    async def test_bulk_save_tasks_is_atomic(
+        self, db: Database, sample_project: Project
+    ):
+        """Test a failing bulk save leaves no partial writes."""
+        new = Task(task_id="T-NEW", project_id=sample_project.project_id, title="New")
+        dup = Task(task_id="T-DUP", project_id=sample_project.project_id, title="Dup")
+        await db.create_task(dup)
+
+        with pytest.raises(sqlite3.IntegrityError):
+            await db.bulk_save_tasks([new, dup], [])
+
+        assert await db.get_task("T-NEW") is None
+
+    async def test_bulk_save_rollback_keeps_concurrent_writes(
+        self, db: Database, sample_project: Project
+    ):
+        """Test a failed bulk save does not roll back another caller's write."""
+        new = Task(task_id="T-NEW", project_id=sample_project.project_id, title="New")
+        dup = Task(task_id="T-DUP", project_id=sample_project.project_id, title="Dup")
+        other = Task(task_id="T-OTHER", project_id=sample_project.project_id, title="O")
+        await db.create_task(dup)
+
+        results = await asyncio.gather(
+            db.bulk_save_tasks([new, dup], []),
+            db.create_task(other),
+            return_exceptions=True,
+        )
+
+        assert isinstance(results[0], sqlite3.IntegrityError)
+        assert await db.get_task("T-NEW") is None
+        assert await db.get_task("T-OTHER") is not None
+
     async def test_get_pending_tasks(self, db: Database, sample_project: Project):
         """Test getting pending tasks with priority ordering."""
         # Create tasks with different priorities
@@ -223,6 +472,30 @@ class TestTaskCRUD:
         # High priority should be first
         assert pending[0].priority == TaskPriority.HIGH
 
+    async def test_get_pending_task_summaries(
+        self, db: Database, sample_project: Project
+    ):
+        """Test pending task summaries truncate descriptions in SQL."""
+        for task_id, priority, description in [
+            ("T-LOW", TaskPriority.LOW, "x" * 300),
+            ("T-HIGH", TaskPriority.HIGH, ""),
+        ]:
+            await db.create_task(
+                Task(
+                    task_id=task_id,
+                    project_id=sample_project.project_id,
+                    title=task_id,
+                    priority=priority,
+                    description=description,
+                )
+            )
+
+        summaries = await db.get_pending_task_summaries(sample_project.project_id)
+        assert [s["task_id"] for s in summaries] == ["T-HIGH", "T-LOW"]
+        assert summaries[0]["description"] is None
+        assert summaries[1]["description"] == "x" * 200
+        assert summaries[1]["priority"] == "low"
+
 
 class TestJobCRUD:
     """Test job CRUD operations."""
@@ -269,6 +542,47 @@ class TestJobCRUD:
         jobs = await db.get_jobs_by_session(sample_session.session_id, limit=3)
         assert len(jobs) == 3
 
+    async def test_get_jobs_by_session_with_status(
+        self, db: Database, sample_session: Session
+    ):
+        """Test filtering session jobs by status."""
+        for i in range(6):
+            job = Job(
+                job_id=f"job-{i:03d}",
+                session_id=sample_session.session_id,
+                project_id=sample_session.project_id,
+                instruction=f"Task {i}",
+                raw_input=f"Do task {i}",
+                status=JobStatus.DONE if i % 2 else JobStatus.FAILED,
+            )
+            await db.create_job(job)
+
+        jobs = await db.get_jobs_by_session(
+            sample_session.session_id, limit=3, status=JobStatus.DONE
+        )
+        assert len(jobs) == 3
+        assert all(j.status == JobStatus.DONE for j in jobs)
+
+    async def test_get_job_summaries_by_session(
+        self, db: Database, sample_session: Session
+    ):
+        """Test job summaries truncate long instructions."""
+        for job_id, instruction in [("job-short", "Fix bug"), ("job-long", "x" * 80)]:
+            job = Job(
+                job_id=job_id,
+                session_id=sample_session.session_id,
+                project_id=sample_session.project_id,
+                instruction=instruction,
+                raw_input=instruction,
+            )
+            await db.create_job(job)
+
+        summaries = await db.get_job_summaries_by_session(sample_session.session_id)
+        by_id = {s["job_id"]: s for s in summaries}
+        assert by_id["job-short"]["instruction"] == "Fix bug"
+        assert by_id["job-long"]["instruction"] == "x" * 50 + "..."
+        assert by_id["job-long"]["status"] == JobStatus.QUEUED.value
+
     async def test_get_running_jobs(self, db: Database, sample_session: Session):
         """Test getting running jobs."""
         job = Job(
@@ -285,6 +599,40 @@ class TestJobCRUD:
         assert len(running) == 1
         assert running[0].job_id == "running-job"
 
+    async def test_cancel_job_atomic(self, db: Database, sample_session: Session):
+        """Test canceling a running job in one conditional update."""
+        job = Job(
+            job_id="cancel-job",
+            session_id=sample_session.session_id,
+            project_id=sample_session.project_id,
+            instruction="Long task",
+            raw_input="Run long task",
+            status=JobStatus.RUNNING,
+        )
+        await db.create_job(job)
+
+        canceled = await db.cancel_job_atomic("cancel-job", datetime.now(timezone.utc))
+        assert canceled is not None
+        assert canceled.status == JobStatus.CANCELED
+        assert canceled.finished_at is not None
+
+        # A finished job is left untouched
+        again = await db.cancel_job_atomic("cancel-job", datetime.now(timezone.utc))
+        assert again is None
+
+    async def test_release_session_job(self, db: Database, sample_session: Session):
+        """Test releasing a session only when it still owns the job."""
+        sample_session.state = SessionState.RUNNING
+        sample_session.current_job_id = "job-a"
+        await db.update_session(sample_session)
+
+        assert not await db.release_session_job(sample_session.session_id, "job-b")
+        assert await db.release_session_job(sample_session.session_id, "job-a")
+
+        session = await db.get_session(sample_session.session_id)
+        assert session.state == SessionState.IDLE
+        assert session.current_job_id is None
+
 
 class TestApprovalCRUD:
     """Test approval CRUD operations."""
@@ -387,3 +735,42 @@ class TestApprovalCRUD:
         result = await db.deny("approval-to-deny", "admin")
         assert result is not None
         assert result.state == ApprovalState.DENIED
+
+    async def test_open_and_resolve_approval(
+        self, db: Database, sample_session: Session
+    ):
+        """Test saving an approval together with its job."""
+        job = Job(
+            job_id="job-gated",
+            session_id=sample_session.session_id,
+            project_id=sample_session.project_id,
+            instruction="Push",
+            raw_input="Push to remote",
+        )
+        await db.create_job(job)
+
+        job.status = JobStatus.WAITING_APPROVAL
+        job.approval_state = ApprovalState.PENDING
+        approval = Approval(
+            approval_id="approval-gated",
+            job_id=job.job_id,
+            session_id=sample_session.session_id,
+            project_id=sample_session.project_id,
+            approval_type=ApprovalType.GIT_PUSH,
+            action_description="Push changes to remote",
+        )
+        await db.open_approval(job, approval)
+
+        assert (await db.get_job("job-gated")).status == JobStatus.WAITING_APPROVAL
+        assert (await db.get_approval_by_job("job-gated")) is not None
+
+        approval.state = ApprovalState.APPROVED
+        job.status = JobStatus.RUNNING
+        job.approval_state = ApprovalState.APPROVED
+        await db.resolve_approval(job, approval)
+
+        saved_job = await db.get_job("job-gated")
+        assert saved_job.status == JobStatus.RUNNING
+        assert saved_job.approval_state == ApprovalState.APPROVED
+        saved = await db.get_approval("approval-gated")
+        assert saved.state == ApprovalState.APPROVED
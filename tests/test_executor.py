@@ -0,0 +1,97 @@
+"""Tests for the job executor."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from televibecode.runner import executor
+from televibecode.runner.executor import _LOG_TAIL_BLOCK, _read_log_tail
+
+
+def _expected_tail(content: str, tail: int) -> str:
+    """Tail of a log as computed by reading the whole file."""
+    lines = content.strip().split("\n")
+    return "\n".join(lines[-tail:]) if tail and len(lines) > tail else content
+
+
+@pytest.fixture
+def log_dir():
+    """Create a temporary directory for log files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+class TestReadLogTail:
+    """Test reading the end of job logs."""
+
+    def _write(self, log_dir: Path, content: str) -> Path:
+        log_path = log_dir / "job.log"
+        log_path.write_bytes(content.encode("utf-8"))
+        return log_path
+
+    def test_missing_log(self, log_dir: Path):
+        """Test a missing log reads as empty."""
+        assert _read_log_tail(log_dir / "missing.log", 10) == ""
+
+    def test_tail_zero_returns_everything(self, log_dir: Path):
+        """Test tail=0 returns the whole log unchanged."""
+        content = "\n  first\nsecond\n\n"
+        assert _read_log_tail(self._write(log_dir, content), 0) == content
+
+    def test_fewer_lines_than_tail(self, log_dir: Path):
+        """Test a short log is returned as is."""
+        content = "one\ntwo\nthree\n"
+        assert _read_log_tail(self._write(log_dir, content), 10) == content
+
+    def test_last_lines(self, log_dir: Path):
+        """Test only the last lines are returned."""
+        content = "".join(f"line {i}\n" for i in range(100))
+        result = _read_log_tail(self._write(log_dir, content), 3)
+        assert result == "line 97\nline 98\nline 99"
+
+    def test_leading_indentation_and_blank_lines(self, log_dir: Path):
+        """Test indentation of the first tail line and inner blank lines."""
+        content = "\n\nheader\n    indented\n\n  nested\nlast\n\n"
+        log_path = self._write(log_dir, content)
+        for tail in range(1, 8):
+            assert _read_log_tail(log_path, tail) == _expected_tail(content, tail)
+
+    def test_line_straddling_block_boundary(self, log_dir: Path):
+        """Test a tail whose first line starts before the last block."""
+        long_line = "  " + "y" * 98
+        # Trailing lines fill all but 50 bytes of the last block, so the
+        # block boundary falls in the middle of long_line
+        count = (_LOG_TAIL_BLOCK - 50) // 2
+        content = "a\n" * 1000 + long_line + "\n" + "b\n" * count
+        boundary = len(content) - _LOG_TAIL_BLOCK
+        start = content.index(long_line)
+        assert start < boundary < start + len(long_line)
+
+        result = _read_log_tail(self._write(log_dir, content), count + 1)
+        assert result == _expected_tail(content, count + 1)
+        assert result.startswith(long_line + "\n")
+
+    def test_no_trailing_newline(self, log_dir: Path):
+        """Test a log whose last line is unterminated."""
+        content = "".join(f"line {i}\n" for i in range(10)) + "partial"
+        result = _read_log_tail(self._write(log_dir, content), 2)
+        assert result == "line 9\npartial"
+
+    def test_matches_full_read_across_blocks(
+        self, log_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test small blocks give the same tail as reading the whole log."""
+        monkeypatch.setattr(executor, "_LOG_TAIL_BLOCK", 4)
+        contents = [
+            "a\nbb\n\n  ccc\n\n\nd\n",
+            "\n\n  indented\n",
+            "  one\n  two\n  three",
+            "x\n" * 20 + "   \n\n",
+        ]
+        for content in contents:
+            log_path = self._write(log_dir, content)
+            for tail in range(0, 12):
+                assert _read_log_tail(log_path, tail) == _expected_tail(
+                    content, tail
+                ), (content, tail)
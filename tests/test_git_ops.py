@@ -0,0 +1,189 @@
+"""Tests for git operations."""
+
+import subprocess
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from televibecode.orchestrator.tools.git_ops import GitOperations
+
+
+def _git(cwd: Path, *args: str) -> str:
+    """Run git in a directory and return its output."""
+    result = subprocess.run(
+        ["git", "-C", str(cwd), *args],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout
+
+
+def _commit(repo: Path, name: str, content: str) -> None:
+    """Write a file and commit it."""
+    (repo / name).write_text(content)
+    _git(repo, "add", name)
+    _git(repo, "commit", "-q", "-m", f"Update {name}")
+
+
+@pytest.fixture
+def workdir(monkeypatch: pytest.MonkeyPatch):
+    """Create a temporary directory with an isolated git identity."""
+    monkeypatch.setenv("GIT_CONFIG_GLOBAL", "/dev/null")
+    monkeypatch.setenv("GIT_CONFIG_NOSYSTEM", "1")
+    for var in ("GIT_AUTHOR", "GIT_COMMITTER"):
+        monkeypatch.setenv(f"{var}_NAME", "Test")
+        monkeypatch.setenv(f"{var}_EMAIL", "test@example.com")
+    with tempfile.TemporaryDirectory() as tmp:
+        yield Path(tmp)
+
+
+@pytest.fixture
+def repo(workdir: Path) -> Path:
+    """Create a repository with one commit on main."""
+    path = workdir / "repo"
+    path.mkdir()
+    _git(path, "init", "-q", "-b", "main")
+    _commit(path, "README.md", "# Test\n")
+    return path
+
+
+class TestBranchStatus:
+    """Test reading branch status from git status porcelain v2."""
+
+    def test_clean_without_upstream(self, repo: Path):
+        """Test a clean branch with no upstream."""
+        status = GitOperations(repo).get_branch_status()
+        assert status == {
+            "branch": "main",
+            "has_changes": False,
+            "staged": 0,
+            "unstaged": 0,
+            "untracked": 0,
+            "ahead": 0,
+            "behind": 0,
+        }
+
+    def test_dirty_worktree(self, repo: Path):
+        """Test counting staged, unstaged, renamed and untracked entries."""
+        _commit(repo, "a.txt", "a\n")
+        _commit(repo, "b.txt", "b\n")
+        (repo / "README.md").write_text("# Changed\n")
+        (repo / "new.txt").write_text("new\n")
+        _git(repo, "add", "new.txt")
+        _git(repo, "mv", "a.txt", "renamed.txt")
+        (repo / "b.txt").write_text("staged\n")
+        _git(repo, "add", "b.txt")
+        (repo / "b.txt").write_text("staged and changed\n")
+        (repo / "untracked.txt").write_text("?\n")
+
+        status = GitOperations(repo).get_branch_status()
+        assert status["has_changes"] is True
+        # new.txt, renamed.txt (a "2" entry) and b.txt
+        assert status["staged"] == 3
+        # README.md and b.txt
+        assert status["unstaged"] == 2
+        assert status["untracked"] == 1
+
+    def test_untracked_only(self, repo: Path):
+        """Test untracked files alone count as changes."""
+        (repo / "untracked.txt").write_text("?\n")
+        status = GitOperations(repo).get_branch_status()
+        assert status["has_changes"] is True
+        assert status["untracked"] == 1
+        assert status["staged"] == status["unstaged"] == 0
+
+    def test_ahead_and_behind(self, workdir: Path, repo: Path):
+        """Test ahead/behind counts against the upstream branch."""
+        clone = workdir / "clone"
+        _git(workdir, "clone", "-q", str(repo), str(clone))
+        _commit(clone, "local1.txt", "1\n")
+        _commit(clone, "local2.txt", "2\n")
+        _commit(repo, "remote.txt", "r\n")
+        _git(clone, "fetch", "-q")
+
+        status = GitOperations(clone).get_branch_status()
+        assert status["branch"] == "main"
+        assert status["ahead"] == 2
+        assert status["behind"] == 1
+        assert status["has_changes"] is False
+
+    def test_detached_head(self, repo: Path):
+        """Test a detached HEAD is reported as such."""
+        _commit(repo, "a.txt", "a\n")
+        _git(repo, "checkout", "-q", "--detach", "HEAD~1")
+        status = GitOperations(repo).get_branch_status()
+        assert status["branch"] == "HEAD (detached)"
+        assert status["ahead"] == status["behind"] == 0
+
+    def test_unmerged_entries(self, repo: Path):
+        """Test merge conflicts count as changes."""
+        _git(repo, "checkout", "-q", "-b", "other")
+        _commit(repo, "README.md", "# Other\n")
+        _git(repo, "checkout", "-q", "main")
+        _commit(repo, "README.md", "# Main\n")
+        merge = subprocess.run(
+            ["git", "-C", str(repo), "merge", "-q", "other"], capture_output=True
+        )
+        assert merge.returncode != 0
+
+        status = GitOperations(repo).get_branch_status()
+        assert status["has_changes"] is True
+        assert status["staged"] == status["unstaged"] == 1
+
+    def test_worktree_path(self, workdir: Path, repo: Path):
+        """Test reading the status of a linked worktree."""
+        worktree = workdir / "wt"
+        _git(repo, "worktree", "add", "-q", "-b", "feature", str(worktree))
+        (worktree / "untracked.txt").write_text("?\n")
+
+        status = GitOperations(repo).get_branch_status(worktree)
+        assert status["branch"] == "feature"
+        assert status["untracked"] == 1
+        assert GitOperations(repo).get_branch_status()["has_changes"] is False
+
+
+class TestRefExists:
+    """Test looking up refs without running git."""
+
+    def test_loose_ref(self, repo: Path):
+        """Test a branch stored as a loose ref file."""
+        _git(repo, "branch", "feature")
+        assert (repo / ".git" / "refs" / "heads" / "feature").is_file()
+        assert GitOperations(repo).branch_exists("feature")
+
+    def test_packed_ref(self, repo: Path):
+        """Test a branch that only exists in packed-refs."""
+        _git(repo, "branch", "feature")
+        _git(repo, "pack-refs", "--all")
+        assert not (repo / ".git" / "refs" / "heads" / "feature").exists()
+
+        git_ops = GitOperations(repo)
+        assert git_ops.branch_exists("feature")
+        assert git_ops.branch_exists("main")
+        assert git_ops._ref_exists("refs/heads/feature")
+
+    def test_missing_ref(self, repo: Path):
+        """Test missing refs, with and without a packed-refs file."""
+        git_ops = GitOperations(repo)
+        assert not (repo / ".git" / "packed-refs").exists()
+        assert not git_ops.branch_exists("missing")
+
+        _git(repo, "branch", "feature")
+        _git(repo, "pack-refs", "--all")
+        assert not git_ops.branch_exists("missing")
+        # Prefixes of packed names do not match
+        assert not git_ops.branch_exists("feat")
+        assert not git_ops._ref_exists("refs/remotes/origin/main")
+
+    def test_from_linked_worktree(self, workdir: Path, repo: Path):
+        """Test refs are read from the common dir of a linked worktree."""
+        worktree = workdir / "wt"
+        _git(repo, "worktree", "add", "-q", "-b", "feature", str(worktree))
+        _git(repo, "pack-refs", "--all")
+
+        git_ops = GitOperations(worktree)
+        assert git_ops.branch_exists("feature")
+        assert git_ops.branch_exists("main")
+        assert not git_ops.branch_exists("missing")